@@ -0,0 +1,221 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from datetime import datetime
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+
+logger = logging.getLogger("api_logger")
+
+
+class Shed(Exception):
+    """Raised when a request is rejected instead of admitted."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit for one route group with a bounded FIFO wait queue.
+
+    The limit adapts AIMD-style: every request finishing under the target
+    latency adds 1/limit (about +1 per full window), and a slow request cuts
+    the limit by `backoff`, at most once per target-latency interval.
+    """
+
+    backoff = 0.9
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        max_queue: int,
+        queue_timeout: float,
+        target_latency: float,
+    ):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.target_latency = target_latency
+        self.inflight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+        self.admitted = 0
+        self.queued = 0
+        self.shed = 0
+        self.timed_out = 0
+
+    async def acquire(self) -> None:
+        if self.inflight < int(self.limit) and not self._waiters:
+            self.inflight += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.shed += 1
+            raise Shed("queue full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # Granted just as the deadline passed; hand the slot back
+                self.release(latency=None)
+            else:
+                waiter.cancel()
+            self.timed_out += 1
+            self.shed += 1
+            raise Shed("queue timeout")
+        except BaseException:
+            # Cancelled while queued (client disconnect, request deadline).
+            # If release() already granted us the slot, pass it on.
+            if waiter.done() and not waiter.cancelled():
+                self.release(latency=None)
+            else:
+                waiter.cancel()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        self.admitted += 1
+
+    def release(self, latency: float | None) -> None:
+        self.inflight -= 1
+        if latency is not None:
+            self._adapt(latency)
+        # The slot passes directly to the next waiter, so inflight is unchanged
+        while self._waiters and self.inflight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self.inflight += 1
+
+    def _adapt(self, latency: float) -> None:
+        if latency <= self.target_latency:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            return
+        now = time.monotonic()
+        if now - self._last_decrease >= self.target_latency:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+            self._last_decrease = now
+
+    def stats(self) -> dict:
+        return {
+            "limit": round(self.limit, 2),
+            "inflight": self.inflight,
+            "queue_length": len(self._waiters),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "shed": self.shed,
+            "timed_out": self.timed_out,
+        }
+
+
+class AdmissionController:
+    """Maps request paths to route groups, each with its own AdaptiveLimiter."""
+
+    def __init__(self, groups: dict[str, str], priority_paths: list[str], enabled: bool = True):
+        # Longest prefix first so /items/stream can override /items
+        self.groups = sorted(groups.items(), key=lambda g: len(g[1]), reverse=True)
+        self.priority_paths = tuple(priority_paths)
+        self.enabled = enabled
+        self.limiters: dict[str, AdaptiveLimiter] = {}
+
+    def limiter_for(self, path: str) -> AdaptiveLimiter | None:
+        if not self.enabled or path.startswith(self.priority_paths):
+            return None
+        name = next((name for name, prefix in self.groups if path.startswith(prefix)), "default")
+        limiter = self.limiters.get(name)
+        if limiter is None:
+            limiter = self.limiters[name] = AdaptiveLimiter(
+                name,
+                initial_limit=settings.admission_initial_limit,
+                min_limit=settings.admission_min_limit,
+                max_limit=settings.admission_max_limit,
+                max_queue=settings.admission_max_queue,
+                queue_timeout=settings.admission_queue_timeout_seconds,
+                target_latency=settings.admission_group_target_latency_ms.get(
+                    name, settings.admission_target_latency_ms
+                ) / 1000,
+            )
+        return limiter
+
+    def stats(self) -> dict:
+        return {name: limiter.stats() for name, limiter in self.limiters.items()}
+
+
+admission_controller = AdmissionController(
+    settings.admission_route_groups,
+    settings.admission_priority_paths,
+    enabled=settings.admission_enabled,
+)
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware that admits, queues or sheds requests per route group.
+    Shed requests get an immediate 503 with Retry-After, before any routing,
+    dependency or database work is done for them.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController = admission_controller):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        limiter = self.controller.limiter_for(scope["path"])
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await limiter.acquire()
+        except Shed as exc:
+            logger.warning(f"Load shed: group={limiter.name} reason={exc.reason} path={scope['path']}")
+            await self._reject(scope, send)
+            return
+
+        start = time.monotonic()
+        latency = None
+        try:
+            await self.app(scope, receive, send)
+            latency = time.monotonic() - start
+        finally:
+            # Failed or cancelled requests don't feed the latency signal
+            limiter.release(latency)
+
+    @staticmethod
+    async def _reject(scope: Scope, send: Send) -> None:
+        body = json.dumps({
+            "status": "error",
+            "message": "Server is overloaded, please retry shortly",
+            "path": scope["path"],
+            "code": 503,
+            "timestamp": datetime.now().isoformat(),
+        }).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", b"1"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,149 @@
+import asyncio
+import math
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.change import ChangeLogHeadDB
+
+logger = logging.getLogger("api_logger")
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one in-flight call.
+
+    The first caller starts the work as a task; callers arriving while it runs
+    await the same task. The work is shielded, so a cancelled caller (e.g. a
+    disconnected client) doesn't cancel it for everyone else.
+    """
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every waiter went away
+            task.exception()
+
+
+class MicroCache:
+    """
+    Short-TTL, size-bounded result cache with single-flight loading.
+
+    A generation counter is bumped by `invalidate()` on every write. Loads
+    remember the generation they started in, and their results are discarded
+    if a write happened meanwhile, so a stale result is never cached.
+
+    `invalidate()` only reaches this process. With a `head` callable returning
+    a counter shared by all workers (the change log head), the cache also
+    compares it at most once per TTL and invalidates itself when it moved:
+    writes made by other workers are then seen within one TTL, including by
+    loads that were in flight when they happened.
+    """
+
+    _MISS = object()
+
+    def __init__(self, ttl_seconds: float, max_entries: int, head: Callable[[], int] | None = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.head = head
+        self.generation = 0
+        self._head_seq: int | None = None
+        self._head_checked_at = -math.inf
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return self._MISS
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return self._MISS
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, generation: int) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def sync_head(self) -> None:
+        """Invalidate if the shared head moved since the last check. Blocking."""
+        self._head_checked_at = time.monotonic()
+        try:
+            seq = self.head()
+        except Exception:
+            logger.exception("Search cache head check failed")
+            seq = None  # can't tell: assume it moved
+        with self._lock:
+            if seq is None or self._head_seq not in (None, seq):
+                self.generation += 1
+                self._entries.clear()
+            self._head_seq = seq
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> T:
+        if self.head is not None and self.ttl_seconds > 0 and (
+            time.monotonic() - self._head_checked_at >= self.ttl_seconds
+        ):
+            await run_in_threadpool(self.sync_head)
+        value = self.get(key)
+        if value is not self._MISS:
+            return value
+        generation = self.generation
+        # Key the flight by generation too: a load started before a write
+        # must not be shared with requests that arrive after it.
+        value = await self._flight.do((generation, key), loader)
+        self.set(key, value, generation)
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def clear(self) -> None:
+        self.invalidate()
+
+
+def change_log_head() -> int:
+    with SessionLocal() as db:
+        return db.execute(select(ChangeLogHeadDB.seq).where(ChangeLogHeadDB.id == 1)).scalar_one()
+
+
+# Results of GET /items/?q=... ; invalidated by ItemRepository writes here
+# and by the change log head for writes made by other workers
+item_search_cache = MicroCache(
+    ttl_seconds=settings.search_cache_ttl_seconds,
+    max_entries=settings.search_cache_max_entries,
+    head=change_log_head,
+)
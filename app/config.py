@@ -16,8 +16,84 @@ class Settings(BaseSettings):
     items_per_user: int = 20
     secret_key: str
     database_url: str = "sqlite:///./sql_app.db"
+    # Read replicas; read-only routes use them, writes always go to database_url
+    database_replica_urls: list[str] = []
+    database_replica_strategy: str = "round_robin"  # or "least_busy"
+    # After a write, keep the client on the primary this long
+    read_your_writes_seconds: float = 5.0
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    refresh_token_expire_days: int = 30
+    # Revoked-token Bloom filter: sized for this many revocations at this
+    # false-positive rate, topped up from the DB every sync interval and
+    # rebuilt (dropping expired entries) every rebuild interval
+    revocation_bloom_capacity: int = 100_000
+    revocation_bloom_error_rate: float = 0.001
+    revocation_sync_seconds: float = 10.0
+    revocation_rebuild_seconds: float = 3600.0
+    # Defer optional startup work (e.g. the suggest index) to first use
+    fast_start: bool = False
+    # How often each worker's suggest index replays other workers' item writes
+    suggest_sync_seconds: float = 5.0
+    search_cache_ttl_seconds: float = 2.0
+    search_cache_max_entries: int = 1024
+    rate_limit_enabled: bool = True
+    # "memory" keeps buckets per process; "sqlite" shares them across workers
+    rate_limit_backend: str = "memory"
+    rate_limit_sqlite_path: str = "./rate_limits.db"
+    rate_limits: dict[str, str] = {
+        "token_ip": "20/minute",
+        "token_username": "5/minute",
+        "item_writes": "60/minute",
+    }
+    admission_enabled: bool = True
+    admission_initial_limit: int = 32
+    admission_min_limit: int = 4
+    admission_max_limit: int = 256
+    admission_max_queue: int = 64
+    admission_queue_timeout_seconds: float = 2.0
+    admission_target_latency_ms: float = 250.0
+    # Per-group overrides; login runs bcrypt and is always slower than 250ms
+    admission_group_target_latency_ms: dict[str, float] = {"auth": 1000.0}
+    # Route group name -> path prefix; unmatched paths share the "default" group
+    admission_route_groups: dict[str, str] = {
+        "auth": "/token",
+        "items": "/items",
+        "users": "/users",
+    }
+    # Never queued or shed (long-lived streams would otherwise hold a slot)
+    admission_priority_paths: list[str] = ["/health", "/metrics", "/items/stream"]
+    # Request deadlines: per path prefix (longest match wins, 0 = none), else
+    # the default. Clients may shorten them with an X-Request-Timeout header.
+    request_timeout_seconds: float = 30.0
+    request_timeouts: dict[str, float] = {"/items/stream": 0}
+    request_timeout_max_seconds: float = 60.0
+    # Event-loop lag monitor (GET /metrics/loop). Strict mode, for dev and
+    # tests, records routes that block the loop past the limit as violations.
+    loop_monitor_enabled: bool = True
+    loop_monitor_interval_ms: float = 50.0
+    loop_stall_threshold_ms: float = 100.0
+    loop_monitor_strict: bool = False
+    loop_block_limit_ms: float = 100.0
+    # Item change events over SSE (GET /items/stream)
+    events_buffer_size: int = 100
+    events_heartbeat_seconds: float = 15.0
+    # "memory" keeps events in-process; "sqlite" also fans out to other workers
+    events_broker: str = "memory"
+    events_sqlite_path: str = "./events.db"
+    events_poll_seconds: float = 0.5
+    # Item change log for GET /items/changes; compacted periodically down to
+    # the newest max entries and the retention window
+    change_log_max_entries: int = 100_000
+    change_log_retention_days: float = 7.0
+    change_log_compact_seconds: float = 300.0
+    # Multi-process server (python -m app.serve); 0 means auto/disabled
+    serve_host: str = "0.0.0.0"
+    serve_port: int = 8000
+    serve_workers: int = 0
+    serve_max_requests: int = 0
+    serve_max_memory_mb: int = 0
+    serve_graceful_timeout_seconds: int = 30
 
     # This tells Pydantic to read from a .env file
     model_config = SettingsConfigDict(env_file=".env")
@@ -1,21 +1,122 @@
-from sqlalchemy import create_engine
+import hashlib
+import itertools
+import sqlite3
+import threading
+import time
+from fastapi import Request, Response
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, delete, insert, select
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy import inspect
+from sqlalchemy.schema import CreateColumn, CreateIndex, CreateTable
 from .config import settings
+from .deadlines import enable_statement_timeouts
 
-connect_args = {}
-if "sqlite" in settings.database_url:
-    connect_args = {"check_same_thread": False}
+def _create_engine(url: str):
+    connect_args = {}
+    if "sqlite" in url:
+        connect_args = {"check_same_thread": False}
+    engine = create_engine(url, connect_args=connect_args)
+    # Statements run during a request are bounded by its deadline
+    enable_statement_timeouts(engine)
+    return engine
 
-engine = create_engine(
-    settings.database_url, connect_args=connect_args
-)
+
+engine = _create_engine(settings.database_url)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
 
+# Bookkeeping table kept outside Base.metadata: one row holding the
+# fingerprint of the models the database schema was last created from.
+_schema_metadata = MetaData()
+schema_version = Table(
+    "schema_version",
+    _schema_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("fingerprint", String, nullable=False),
+)
+
+
+def schema_fingerprint(dialect=None) -> str:
+    """Hash of the DDL for every model table and index."""
+    dialect = dialect or engine.dialect
+    ddl = []
+    for table in Base.metadata.sorted_tables:
+        ddl.append(str(CreateTable(table).compile(dialect=dialect)))
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            ddl.append(str(CreateIndex(index).compile(dialect=dialect)))
+    return hashlib.sha256("\n".join(ddl).encode()).hexdigest()[:16]
+
+
+def _add_missing_columns(bind) -> None:
+    """
+    create_all never alters existing tables, so add columns (and their
+    indexes) introduced since the table was created. New columns must be
+    nullable or carry a server default for this to work on populated tables.
+    """
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            missing = [c for c in table.columns if c.name not in existing]
+            for column in missing:
+                spec = CreateColumn(column).compile(dialect=bind.dialect)
+                conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {spec}")
+            for index in table.indexes:
+                if any(c.name in {m.name for m in missing} for c in index.columns):
+                    index.create(conn, checkfirst=True)
+
+
+# Indexes since removed from the models, dropped from existing databases
+RETIRED_INDEXES = ["ix_items_name"]  # covered by ix_items_name_price
+
+
+def ensure_schema(bind=None) -> bool:
+    """
+    Create missing tables only when the models changed since the last boot.
+    A matching fingerprint costs one indexed SELECT instead of a
+    `create_all` round of table reflection. Returns True if DDL ran.
+    """
+    bind = bind or engine
+    fingerprint = schema_fingerprint(bind.dialect)
+    try:
+        with bind.connect() as conn:
+            current = conn.execute(select(schema_version.c.fingerprint)).scalar()
+    except DBAPIError:
+        current = None  # fresh database without the bookkeeping table
+    if current == fingerprint:
+        return False
+
+    Base.metadata.create_all(bind=bind)
+    _add_missing_columns(bind)
+    _schema_metadata.create_all(bind=bind)
+    with bind.begin() as conn:
+        # create_all skips existing tables and so their new indexes too
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+        for name in RETIRED_INDEXES:
+            conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+        conn.execute(delete(schema_version))
+        conn.execute(insert(schema_version).values(id=1, fingerprint=fingerprint))
+    return True
+
+
+def dispose_engine_after_fork():
+    """
+    Give a forked worker its own connection pools (primary and replicas).
+    close=False drops the inherited pools without closing the parent's
+    connections, which would otherwise be shared across processes.
+    """
+    engine.dispose(close=False)
+    for replica in replicas.replicas:
+        replica.engine.dispose(close=False)
+
+
 # Dependency
 def get_db():
     """
@@ -27,3 +128,100 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# ==================== Read/Write Routing ====================
+# Clients that wrote recently carry this cookie (a unix timestamp) and are
+# routed to the primary until it expires, so they read their own writes
+# even if the replicas lag behind.
+PRIMARY_STICKY_COOKIE = "db_primary_until"
+
+
+class Replica:
+    def __init__(self, url: str):
+        self.url = url
+        self.engine = _create_engine(url)
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.in_use = 0
+
+
+class ReplicaSet:
+    """Picks a read replica per session: round-robin or least in-use sessions."""
+
+    def __init__(self, urls: list[str], strategy: str = "round_robin"):
+        self.replicas = [Replica(url) for url in urls]
+        self.strategy = strategy
+        self._cycle = itertools.cycle(self.replicas)
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def acquire(self) -> Replica:
+        with self._lock:
+            if self.strategy == "least_busy":
+                replica = min(self.replicas, key=lambda r: r.in_use)
+            else:
+                replica = next(self._cycle)
+            replica.in_use += 1
+            return replica
+
+    def release(self, replica: Replica) -> None:
+        with self._lock:
+            replica.in_use -= 1
+
+
+replicas = ReplicaSet(settings.database_replica_urls, settings.database_replica_strategy)
+
+
+def get_write_db(response: Response):
+    """
+    Session on the primary for routes that write.
+    Marks the client sticky to the primary for `read_your_writes_seconds`.
+    """
+    if replicas:
+        until = int(time.time() + settings.read_your_writes_seconds)
+        response.set_cookie(
+            PRIMARY_STICKY_COOKIE,
+            str(until),
+            max_age=int(settings.read_your_writes_seconds),
+            httponly=True,
+            samesite="lax",
+        )
+    yield from get_db()
+
+
+def get_read_db(request: Request):
+    """
+    Session for read-only routes: a replica when configured, otherwise the
+    primary. Clients that wrote recently stay on the primary.
+    """
+    try:
+        sticky = float(request.cookies.get(PRIMARY_STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        sticky = False
+    if sticky or not replicas:
+        yield from get_db()
+        return
+
+    replica = replicas.acquire()
+    db = replica.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        replicas.release(replica)
+
+
+def refresh_sqlite_replicas() -> None:
+    """
+    Local stand-in for replication: copy the primary SQLite database over
+    every SQLite replica file using SQLite's online backup API.
+    """
+    primary = engine.url.database
+    for replica in replicas.replicas:
+        if replica.engine.url.get_backend_name() != "sqlite":
+            continue
+        replica.engine.dispose()
+        with sqlite3.connect(primary) as src, sqlite3.connect(replica.engine.url.database) as dst:
+            src.backup(dst)
@@ -0,0 +1,296 @@
+import asyncio
+import contextlib
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Callable, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+logger = logging.getLogger("api_logger")
+
+T = TypeVar("T")
+
+
+class Deadline:
+    """
+    Point in time by which a request must be finished, or the reason it was
+    given up early (e.g. the client disconnected). Database connections in
+    use by the request register callbacks that abort their running statement.
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+        self.reason: str | None = None
+        self._callbacks: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.reason is not None or time.monotonic() >= self.expires_at
+
+    def on_cancel(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if self.reason is None:
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def finish(self) -> None:
+        """
+        The response has been sent: stop enforcing the deadline for work
+        that still runs afterwards (dependency teardown, background tasks).
+        """
+        self.expires_at = math.inf
+
+    def cancel(self, reason: str) -> None:
+        """Give up on the request and abort its in-flight statements."""
+        with self._lock:
+            if self.reason is not None:
+                return
+            self.reason = reason
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                logger.exception("Failed to abort statement")
+
+
+# Set by DeadlineMiddleware for the duration of a request. Context variables
+# are copied into threadpool calls, so sync routes see it too.
+current_deadline: ContextVar[Deadline | None] = ContextVar("current_deadline", default=None)
+
+
+def without_deadline(fn: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Run `fn` outside the current request's deadline. For work shared by
+    several requests (e.g. a coalesced load), which one caller giving up
+    must not abort for the others; each still stops waiting at its own.
+    """
+    token = current_deadline.set(None)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        current_deadline.reset(token)
+
+
+# ==================== Statement Timeouts ====================
+def is_statement_timeout(exc: DBAPIError) -> bool:
+    """Whether `exc` is a statement aborted by a timeout or interrupt."""
+    orig = exc.orig
+    # 57014 is PostgreSQL's query_canceled (statement_timeout, cancel request)
+    if "57014" in (getattr(orig, "sqlstate", None), getattr(orig, "pgcode", None)):
+        return True
+    return isinstance(orig, sqlite3.OperationalError) and str(orig) == "interrupted"
+
+
+def enable_statement_timeouts(engine) -> None:
+    """
+    Bound every statement run under a request deadline by the time left.
+
+    - PostgreSQL: `SET LOCAL statement_timeout` before each statement, plus a
+      cancel request to the server if the deadline is cancelled early.
+    - SQLite: a progress handler that interrupts the running statement (and
+      the rows still being stepped through) once the deadline has passed,
+      plus `interrupt()` when it is cancelled early.
+    Statements outside a request deadline (startup, background jobs) are
+    unaffected.
+    """
+    dialect = engine.dialect.name
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def apply_deadline(conn, cursor, statement, parameters, context, executemany):
+        deadline = current_deadline.get()
+        if deadline is None:
+            return
+        fairy = conn.connection
+        dbapi_conn = fairy.dbapi_connection
+        if dialect == "postgresql" and math.isfinite(deadline.remaining()):
+            timeout_ms = max(1, math.ceil(deadline.remaining() * 1000))
+            cursor.execute(f"SET LOCAL statement_timeout = {timeout_ms}")
+        if fairy.info.get("deadline") is deadline:
+            return
+        fairy.info["deadline"] = deadline
+        if dialect == "sqlite":
+            dbapi_conn.set_progress_handler(lambda: deadline.expired, 1000)
+            abort = dbapi_conn.interrupt
+        elif dialect == "postgresql":
+            abort = dbapi_conn.cancel
+        else:
+            return
+        # Only abort while the connection is still checked out for this request
+        deadline.on_cancel(lambda: fairy.info.get("deadline") is deadline and abort())
+
+    @event.listens_for(engine, "checkin")
+    def clear_deadline(dbapi_conn, record):
+        if record.info.pop("deadline", None) is not None and dialect == "sqlite":
+            dbapi_conn.set_progress_handler(None, 0)
+
+
+# ==================== Middleware ====================
+def _parse_timeout(value: str | None) -> float | None:
+    try:
+        timeout = float(value) if value else None
+    except ValueError:
+        return None
+    return timeout if timeout and timeout > 0 else None
+
+
+class DeadlineMiddleware:
+    """
+    ASGI middleware giving each request a deadline: the route's timeout from
+    `Settings.request_timeouts` (longest matching prefix, else
+    `request_timeout_seconds`), shortened by an `X-Request-Timeout` header.
+
+    When the deadline passes the request is cancelled and, if nothing has
+    been sent yet, answered with a 504. A client disconnect cancels it too.
+    Either way running statements are aborted, so threadpool work unwinds
+    and connections go back to the pool instead of finishing a query no one
+    will read. Pure-Python blocking work (e.g. bcrypt) can't be interrupted
+    and finishes before its thread is released. Once the last body chunk
+    has been sent, neither applies: dependency teardown and background
+    tasks run to completion.
+    """
+
+    def __init__(self, app: ASGIApp, timeouts: dict[str, float] | None = None, default: float | None = None):
+        self.app = app
+        timeouts = settings.request_timeouts if timeouts is None else timeouts
+        self.routes = sorted(timeouts.items(), key=lambda r: len(r[0]), reverse=True)
+        self.default = settings.request_timeout_seconds if default is None else default
+
+    def timeout_for(self, scope: Scope) -> float | None:
+        path = scope["path"]
+        timeout = next((t for prefix, t in self.routes if path.startswith(prefix)), self.default)
+        headers = dict(scope.get("headers") or [])
+        requested = _parse_timeout(headers.get(b"x-request-timeout", b"").decode("latin-1"))
+        if requested is not None:
+            limit = timeout or settings.request_timeout_max_seconds
+            timeout = min(requested, limit, settings.request_timeout_max_seconds)
+        return timeout or None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        timeout = self.timeout_for(scope) if scope["type"] == "http" else None
+        if timeout is None:
+            await self.app(scope, receive, send)
+            return
+
+        deadline = Deadline(timeout)
+        disconnected = asyncio.Event()
+        # Set only by a disconnect before the response was complete; servers
+        # also send http.disconnect once the last body chunk has gone out
+        gave_up = asyncio.Event()
+        pending: list[Message] = []
+        watcher: asyncio.Task | None = None
+        response_started = response_complete = False
+
+        async def watch_disconnect():
+            # The request body has been read, so the next message can only
+            # be the disconnect
+            await receive()
+            disconnected.set()
+            if not response_complete:
+                gave_up.set()
+
+        def start_watcher():
+            nonlocal watcher
+            watcher = asyncio.create_task(watch_disconnect())
+
+        async def wrapped_receive() -> Message:
+            if pending:
+                return pending.pop()
+            if watcher is not None:
+                await disconnected.wait()
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                disconnected.set()
+                if not response_complete:
+                    gave_up.set()
+            elif not message.get("more_body", False):
+                start_watcher()
+            return message
+
+        async def wrapped_send(message: Message) -> None:
+            nonlocal response_started, response_complete
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete = True
+                deadline.finish()
+
+        headers = dict(scope.get("headers") or [])
+        if b"content-length" not in headers and b"transfer-encoding" not in headers:
+            # No body: the app may never call receive, so watch from the start
+            pending.append(await receive())
+            start_watcher()
+
+        token = current_deadline.set(deadline)
+        app_task = asyncio.create_task(self.app(scope, wrapped_receive, wrapped_send))
+        stop = asyncio.create_task(gave_up.wait())
+        try:
+            done, _ = await asyncio.wait(
+                {app_task, stop}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if app_task not in done and response_complete:
+                # Only the request's tail is left (teardown, background tasks)
+                await asyncio.wait({app_task})
+            elif app_task not in done:
+                reason = "client disconnected" if gave_up.is_set() else "deadline exceeded"
+                deadline.cancel(reason)
+                app_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await app_task
+                logger.warning(f"Request cancelled: {reason} path={scope['path']} timeout={timeout}s")
+                if not gave_up.is_set() and not response_started:
+                    await self._timeout_response(scope, send)
+                return
+            try:
+                app_task.result()
+            except DBAPIError as exc:
+                # The statement timeout can fire a moment before our own
+                # timer, or the statement belonged to another request
+                if response_started or not (deadline.expired or is_statement_timeout(exc)):
+                    raise
+                logger.warning(f"Statement aborted by deadline path={scope['path']} timeout={timeout}s")
+                await self._timeout_response(scope, send)
+        finally:
+            current_deadline.reset(token)
+            if not app_task.done():
+                app_task.cancel()  # we were cancelled ourselves, e.g. on shutdown
+            stop.cancel()
+            if watcher is not None:
+                watcher.cancel()
+
+    @staticmethod
+    async def _timeout_response(scope: Scope, send: Send) -> None:
+        body = json.dumps({
+            "status": "error",
+            "message": "Request took too long and was cancelled",
+            "path": scope["path"],
+            "code": 504,
+            "timestamp": datetime.now().isoformat(),
+        }).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 504,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
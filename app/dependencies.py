@@ -2,57 +2,69 @@ from fastapi import Depends, HTTPException
 from typing import Annotated
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_read_db
 import app.models as models
 from app.schemas.user import User
 import app.security as security
-from app.config import settings
 import time
+from app.repositories import BatchLoader, ItemRepository
+from app.revocation import revocation_list
 
 # ==================== Security Configuration ====================
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-fake_users_db = {
-    "johndoe": {
-        "username": "johndoe",
-        "full_name": "John Doe",
-        "email": "johndoe@example.com",
-        "hashed_password": security.get_password_hash("secret"),
-        "disabled": False,
-    }
-}
-
-async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    db: Annotated[Session, Depends(get_db)]
-):
-    """
-    Dependency to validate the JWT token and return the current user from the database.
-    """
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=401,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+async def get_token_payload(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: Annotated[Session, Depends(get_read_db)]
+) -> dict:
+    """
+    Dependency to validate the JWT access token and return its claims.
+    Revoked tokens are rejected; the Bloom filter in front of the
+    revocation list means a valid token normally costs no extra query.
+    """
     try:
-        # Decode the JWT
-        payload = security.jwt.decode(
-            token, settings.secret_key, algorithms=[settings.algorithm]
-        )
-
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
+        payload = security.decode_token(token)
     except security.jwt.JWTError:
-        raise credentials_exception
-    
-    # Fetch user from database
-    user = db.query(models.UserDB).filter(models.UserDB.username == username).first()
+        raise _credentials_exception()
+    if payload.get("sub") is None:
+        raise _credentials_exception()
+
+    jti = payload.get("jti")
+    if jti is not None and await revocation_list.is_revoked_async(db, jti):
+        raise _credentials_exception()
+    return payload
+
+
+async def get_current_user(
+    payload: Annotated[dict, Depends(get_token_payload)],
+    db: Annotated[Session, Depends(get_read_db)]
+):
+    """
+    Dependency to validate the JWT token and return the current user from the database.
+    """
+    user = db.query(models.UserDB).filter(models.UserDB.username == payload["sub"]).first()
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     return user
 
 
+def get_item_loader(db: Annotated[Session, Depends(get_read_db)]) -> BatchLoader:
+    """
+    Request-scoped item loader.
+    FastAPI caches dependencies per request, so every dependant in the same
+    request shares one loader and its lookups are merged into one IN query.
+    """
+    return BatchLoader(ItemRepository(db))
+
+
 def send_welcome_email(email: str):
     """
     Simulates a slow network call (e.g., sending an email).
@@ -0,0 +1,225 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+
+
+def format_sse(event: str, data: dict) -> str:
+    """Encode one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+class Subscription:
+    """
+    One SSE client's bounded buffer of pre-encoded messages.
+    An idle subscription is just a deque and an unset asyncio.Event.
+    """
+
+    def __init__(self, max_buffer: int):
+        self.max_buffer = max_buffer
+        self.buffer: deque[str] = deque()
+        self.overflowed = False
+        self._ready = asyncio.Event()
+
+    def push(self, message: str) -> bool:
+        """Queue a message; returns False once the buffer has overflowed."""
+        if len(self.buffer) >= self.max_buffer:
+            self.overflowed = True
+            self.buffer.clear()
+        else:
+            self.buffer.append(message)
+        self._ready.set()
+        return not self.overflowed
+
+    async def get(self, timeout: float) -> str | None:
+        """Next message, or None if nothing arrived within `timeout` seconds."""
+        if not self.buffer:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self.buffer.popleft() if self.buffer else None
+
+
+# ==================== Brokers ====================
+class SQLiteEventBroker:
+    """
+    Local stand-in for a message broker: an SQLite file shared by the worker
+    processes on one host. Each worker appends the events it publishes and
+    polls for events published by the others. Old rows are trimmed as it goes.
+    """
+
+    retention_seconds = 60.0
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._last_seq: int | None = None
+        self._last_trim = 0.0
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS events (seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "origin INTEGER NOT NULL, message TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def publish(self, message: str) -> None:
+        self._conn().execute(
+            "INSERT INTO events (origin, message, created) VALUES (?, ?, ?)",
+            # Origin is read per call: workers forked from one master share this object
+            (os.getpid(), message, time.time()),
+        )
+
+    def poll(self) -> list[str]:
+        """Messages published by other processes since the previous poll."""
+        conn = self._conn()
+        if self._last_seq is None:
+            # Start from now; subscribers don't get a backlog
+            self._last_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM events").fetchone()[0]
+            return []
+        rows = conn.execute(
+            "SELECT seq, origin, message FROM events WHERE seq > ? ORDER BY seq",
+            (self._last_seq,),
+        ).fetchall()
+        if rows:
+            self._last_seq = rows[-1][0]
+        now = time.time()
+        if now - self._last_trim > self.retention_seconds:
+            conn.execute("DELETE FROM events WHERE created < ?", (now - self.retention_seconds,))
+            self._last_trim = now
+        pid = os.getpid()
+        return [message for _, origin, message in rows if origin != pid]
+
+    def reset(self) -> None:
+        self._last_seq = None
+
+
+# ==================== Hub ====================
+class EventHub:
+    """
+    In-process broadcast of item change events to SSE subscribers.
+
+    `publish` may be called from any thread (sync routes write from the
+    threadpool); messages are encoded once and handed to the event loop,
+    which appends them to every subscriber's bounded buffer. A subscriber
+    whose buffer fills up is disconnected instead of slowing everyone down
+    or growing without bound. With a broker, events are also fanned out to
+    the other worker processes, polled by one task per worker while anyone
+    is subscribed.
+    """
+
+    def __init__(self, buffer_size: int, broker: SQLiteEventBroker | None = None, poll_seconds: float = 0.5):
+        self.buffer_size = buffer_size
+        self.broker = broker
+        self.poll_seconds = poll_seconds
+        self._subscribers: set[Subscription] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._poller: asyncio.Task | None = None
+        self.published = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscription:
+        """Register a subscriber; must be called on the event loop."""
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(self.buffer_size)
+        self._subscribers.add(subscription)
+        if self.broker is not None and self._poller is None:
+            self._poller = self._loop.create_task(self._poll_broker())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def publish(self, event: str, data: dict) -> None:
+        message = format_sse(event, data)
+        self.published += 1
+        if self.broker is not None:
+            self.broker.publish(message)
+        self._dispatch_threadsafe(message)
+
+    def _dispatch_threadsafe(self, message: str) -> None:
+        loop = self._loop
+        if not self._subscribers or loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._dispatch(message)
+        else:
+            loop.call_soon_threadsafe(self._dispatch, message)
+
+    def _dispatch(self, message: str) -> None:
+        for subscription in list(self._subscribers):
+            if not subscription.push(message):
+                self._subscribers.discard(subscription)
+                self.dropped += 1
+
+    async def _poll_broker(self) -> None:
+        try:
+            while self._subscribers:
+                for message in await run_in_threadpool(self.broker.poll):
+                    self._dispatch(message)
+                await asyncio.sleep(self.poll_seconds)
+        finally:
+            self.broker.reset()
+            self._poller = None
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "dropped_slow_consumers": self.dropped,
+            "broker": type(self.broker).__name__ if self.broker else None,
+        }
+
+
+async def sse_stream(hub: EventHub, heartbeat_seconds: float):
+    """
+    Body of an SSE response: events as they are published, plus comment
+    lines as keep-alives so proxies don't close idle connections.
+    Ends with an `overflow` event if the client can't keep up.
+    """
+    subscription = hub.subscribe()
+    try:
+        yield "retry: 3000\n: connected\n\n"
+        while True:
+            message = await subscription.get(heartbeat_seconds)
+            if subscription.overflowed:
+                yield format_sse("overflow", {"detail": "Client too slow, reconnect and resync"})
+                return
+            yield message if message is not None else ": keep-alive\n\n"
+    finally:
+        hub.unsubscribe(subscription)
+
+
+def _create_broker() -> SQLiteEventBroker | None:
+    if settings.events_broker == "sqlite":
+        return SQLiteEventBroker(settings.events_sqlite_path)
+    return None
+
+
+# Published to by ItemRepository writes, streamed by GET /items/stream
+item_events = EventHub(
+    settings.events_buffer_size,
+    broker=_create_broker(),
+    poll_seconds=settings.events_poll_seconds,
+)
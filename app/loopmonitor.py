@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from dataclasses import dataclass, field
+
+from app.config import settings
+
+logger = logging.getLogger("api_logger")
+
+
+@dataclass
+class Stall:
+    """One period during which the event loop could not run other tasks."""
+    duration: float
+    route: str | None = None
+    function: str | None = None
+    stack: list[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return {
+            "duration_ms": round(self.duration * 1000, 1),
+            "route": self.route,
+            "function": self.function,
+            "stack": self.stack,
+        }
+
+
+def _route_of(frame) -> str | None:
+    """The route being served by the coroutine running in `frame`, if any."""
+    while frame is not None:
+        scope = frame.f_locals.get("scope")
+        if isinstance(scope, dict) and "route" in scope:
+            return f"{scope.get('method')} {scope['route'].path}"
+        frame = frame.f_back
+    return None
+
+
+def _app_function(frame) -> str | None:
+    """Innermost frame in the application's own code, e.g. a route handler."""
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("app.") and module != __name__:
+            return f"{module}.{frame.f_code.co_qualname}"
+        frame = frame.f_back
+    return None
+
+
+class LoopMonitor:
+    """
+    Measures event-loop lag and catches what is blocking the loop.
+
+    A task on the loop sleeps `interval` seconds at a time; how late it wakes
+    up is the lag. A watchdog thread notices when the task has not run for
+    longer than `stall_threshold` and, while the loop is still stuck, grabs
+    the loop thread's stack. That stack shows the blocking call and the
+    coroutine that made it, which is attributed to its route.
+
+    In strict mode (for development and tests) stalls inside a route longer
+    than `fail_threshold` are also collected as violations.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.05,
+        stall_threshold: float = 0.1,
+        strict: bool = False,
+        fail_threshold: float = 0.1,
+        history: int = 50,
+        window: int = 1000,
+    ):
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.strict = strict
+        self.fail_threshold = fail_threshold
+        self.stalls: deque[Stall] = deque(maxlen=history)
+        self.stalls_by_route: Counter[str] = Counter()
+        self.violations: list[Stall] = []
+        self._lags: deque[float] = deque(maxlen=window)
+        self._max_lag = 0.0
+        self._beat = time.monotonic()
+        self._captured: Stall | None = None
+        self._loop_thread: int | None = None
+        self._task: asyncio.Task | None = None
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+
+    # ==================== Lifecycle ====================
+    def start(self) -> None:
+        """Start monitoring the running loop; call from the app lifespan."""
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stopped = threading.Event()
+        self._task = asyncio.get_running_loop().create_task(self._measure())
+        threading.Thread(
+            target=self._watch, args=(self._stopped,), name="loop-monitor", daemon=True
+        ).start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    # ==================== Measuring ====================
+    async def _measure(self) -> None:
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._record(max(0.0, now - start - self.interval))
+            self._beat = now
+
+    def _record(self, lag: float) -> None:
+        self._lags.append(lag)
+        self._max_lag = max(self._max_lag, lag)
+        with self._lock:
+            stall, self._captured = self._captured, None
+        if lag < self.stall_threshold:
+            return
+        stall = stall or Stall(duration=lag)
+        stall.duration = lag
+        self.stalls.append(stall)
+        self.stalls_by_route[stall.route or "unknown"] += 1
+        logger.warning(
+            f"Event loop blocked for {lag * 1000:.0f}ms route={stall.route} function={stall.function}\n"
+            + "".join(stall.stack[-8:])
+        )
+        if self.strict and stall.route is not None and lag >= self.fail_threshold:
+            self.violations.append(stall)
+
+    def _watch(self, stopped: threading.Event) -> None:
+        poll = min(self.interval, self.stall_threshold) / 2
+        while not stopped.wait(poll):
+            blocked = time.monotonic() - self._beat - self.interval
+            if blocked < self.stall_threshold or self._captured is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            stall = Stall(
+                duration=blocked,
+                route=_route_of(frame),
+                function=_app_function(frame),
+                stack=traceback.format_stack(frame)[-30:],
+            )
+            with self._lock:
+                self._captured = stall
+
+    # ==================== Reporting ====================
+    def take_violations(self) -> list[Stall]:
+        violations, self.violations = self.violations, []
+        return violations
+
+    def stats(self) -> dict:
+        lags = sorted(self._lags)
+
+        def percentile(p: float) -> float:
+            return round(lags[min(len(lags) - 1, int(len(lags) * p))] * 1000, 2) if lags else 0.0
+
+        return {
+            "lag_ms": {
+                "last": round(self._lags[-1] * 1000, 2) if self._lags else 0.0,
+                "p50": percentile(0.5),
+                "p99": percentile(0.99),
+                "max": round(self._max_lag * 1000, 2),
+            },
+            "stall_threshold_ms": self.stall_threshold * 1000,
+            "stalls_total": sum(self.stalls_by_route.values()),
+            "stalls_by_route": dict(self.stalls_by_route),
+            "recent_stalls": [stall.as_dict() for stall in list(self.stalls)[-10:]],
+        }
+
+
+loop_monitor = LoopMonitor(
+    interval=settings.loop_monitor_interval_ms / 1000,
+    stall_threshold=settings.loop_stall_threshold_ms / 1000,
+    strict=settings.loop_monitor_strict,
+    fail_threshold=settings.loop_block_limit_ms / 1000,
+)
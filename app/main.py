@@ -1,32 +1,106 @@
+import asyncio
 import logging
 import time
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from app.database import engine, Base
+from app.config import settings
+from app.database import engine, ensure_schema, SessionLocal
+from app.suggest import item_name_index
+from app.revocation import revocation_list
+from app.repositories import ChangeLogRepository
+from app.admission import AdmissionControlMiddleware
+from app.deadlines import DeadlineMiddleware
+from app.loopmonitor import loop_monitor
 from app.routers import items, users, misc
 
 # Configure basic logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("api_logger")
 
+# ==================== Background Jobs ====================
+def compact_change_log() -> int:
+    with SessionLocal() as db:
+        return ChangeLogRepository(db).compact(
+            settings.change_log_max_entries,
+            timedelta(days=settings.change_log_retention_days),
+        )
+
+
+async def compact_change_log_periodically():
+    """Keep the item change log bounded; safe to run in every worker."""
+    while True:
+        await asyncio.sleep(settings.change_log_compact_seconds)
+        try:
+            removed = await run_in_threadpool(compact_change_log)
+            if removed:
+                logger.info(f"🧹 Change log compacted: removed={removed}")
+        except Exception:
+            logger.exception("Change log compaction failed")
+
+
+def build_startup_indexes() -> None:
+    with SessionLocal() as db:
+        item_name_index.build(db)
+        revocation_list.rebuild(db)
+
+
+def sync_name_index() -> int:
+    with SessionLocal() as db:
+        return item_name_index.sync(db)
+
+
+async def sync_name_index_periodically():
+    """Pick up item writes made by other workers from the change log."""
+    while True:
+        await asyncio.sleep(settings.suggest_sync_seconds)
+        if not item_name_index.ready:
+            continue
+        try:
+            await run_in_threadpool(sync_name_index)
+        except Exception:
+            logger.exception("Suggest index sync failed")
+
+
 # ==================== Database Initialization ====================
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Lifespan context manager for database initialization.
-    Creates all database tables on startup.
+    Creates missing tables on startup when the models have changed.
     """
-    # Startup: Create all tables
-    Base.metadata.create_all(bind=engine)
-    logger.info("✅ Database tables created successfully!")
+    # Startup: a schema fingerprint check instead of create_all on every boot
+    if ensure_schema(engine):
+        logger.info("✅ Database tables created successfully!")
+    else:
+        logger.info("✅ Database schema is up to date")
+    if settings.fast_start:
+        logger.info("⚡ Fast start: suggest index and revocation filter will be built on first use")
+    else:
+        # Build the in-memory autocomplete index over item names
+        # and the Bloom filter of revoked tokens
+        # off the event loop; trigram postings follow in the background
+        await run_in_threadpool(build_startup_indexes)
+        stats = item_name_index.memory_usage()
+        logger.info(
+            f"🔎 Suggest index ready: names={stats['names']} "
+            f"memory={stats['total_bytes'] / 1024:.1f}KiB (before trigram postings)"
+        )
+    compaction = asyncio.create_task(compact_change_log_periodically())
+    index_sync = asyncio.create_task(sync_name_index_periodically())
+    if settings.loop_monitor_enabled:
+        loop_monitor.start()
     yield
     # Shutdown: Cleanup (if needed)
+    loop_monitor.stop()
+    compaction.cancel()
+    index_sync.cancel()
     logger.info("👋 Application shutting down...")
 
 
@@ -76,6 +150,15 @@ app = FastAPI(
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
+# ==================== Admission Control ====================
+# Added before CORS so it sits inside it: shed 503s still get CORS headers
+# and are logged by log_requests.
+app.add_middleware(AdmissionControlMiddleware)
+
+# ==================== Request Deadlines ====================
+# Outside admission control so time spent queued counts against the deadline
+app.add_middleware(DeadlineMiddleware)
+
 # ==================== CORS Configuration ====================
 origins = [
     "http://localhost:3000",
@@ -124,6 +207,8 @@ async def custom_http_exception_handler(request: Request, exc: StarletteHTTPExce
             "code": exc.status_code,
             "timestamp": datetime.now().isoformat()
         },
+        # Keep headers like WWW-Authenticate and Retry-After
+        headers=getattr(exc, "headers", None),
     )
 
 # ==================== Include Routers ====================
@@ -2,5 +2,7 @@
 
 from app.models.item import ItemDB
 from app.models.user import UserDB
+from app.models.token import RevokedTokenDB
+from app.models.change import ChangeLogDB, ChangeLogHeadDB
 
-__all__ = ["ItemDB", "UserDB"]
+__all__ = ["ItemDB", "UserDB", "RevokedTokenDB", "ChangeLogDB", "ChangeLogHeadDB"]
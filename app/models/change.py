@@ -0,0 +1,38 @@
+from sqlalchemy import JSON, Column, DateTime, DDL, Integer, String, event
+from app.database import Base
+
+class ChangeLogDB(Base):
+    """
+    SQLAlchemy model for the append-only change log.
+    One row per create/update/delete, written in the same transaction as
+    the change itself, ordered by a gap-free, commit-ordered `seq`.
+    """
+    __tablename__ = "change_log"
+
+    seq = Column(Integer, primary_key=True, autoincrement=False)
+    entity = Column(String, nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    action = Column(String, nullable=False)
+    # Public fields after the change; null for deletes
+    data = Column(JSON, nullable=True)
+    # Naive UTC
+    created_at = Column(DateTime, nullable=False, index=True)
+
+
+class ChangeLogHeadDB(Base):
+    """
+    Single-row table holding the last issued sequence number and the
+    highest sequence number removed by compaction.
+    """
+    __tablename__ = "change_log_head"
+
+    id = Column(Integer, primary_key=True)
+    seq = Column(Integer, nullable=False, default=0)
+    compacted_seq = Column(Integer, nullable=False, default=0)
+
+
+event.listen(
+    ChangeLogHeadDB.__table__,
+    "after_create",
+    DDL("INSERT INTO change_log_head (id, seq, compacted_seq) VALUES (1, 0, 0)"),
+)
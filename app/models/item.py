@@ -1,6 +1,10 @@
-from sqlalchemy import Column, Integer, String, Float
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, Float, text
 from app.database import Base
 
+TAXED = text("tax IS NOT NULL")
+UNTAXED = text("tax IS NULL")
+
+
 class ItemDB(Base):
     """
     SQLAlchemy model for the items table.
@@ -8,7 +12,27 @@ class ItemDB(Base):
     __tablename__ = "items"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, index=True)
+    # No single-column index: ix_items_name_price serves name lookups too
+    name = Column(String)
     price = Column(Float)
     description = Column(String, nullable=True)
     tax = Column(Float, nullable=True)
+    # Nullable so items created before ownership existed stay valid
+    owner_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=True)
+
+    # Composite indexes backing the price/tax filters and sorts on GET /items/.
+    # (price, name) serves price ranges in price order; (name, price) serves
+    # name order while checking price from the index itself. has_tax maps to
+    # `tax IS [NOT] NULL`, so each index has a partial copy per predicate.
+    __table_args__ = (
+        Index("ix_items_price_name", "price", "name"),
+        Index("ix_items_taxed_price_name", "price", "name",
+              sqlite_where=TAXED, postgresql_where=TAXED),
+        Index("ix_items_untaxed_price_name", "price", "name",
+              sqlite_where=UNTAXED, postgresql_where=UNTAXED),
+        Index("ix_items_name_price", "name", "price"),
+        Index("ix_items_taxed_name_price", "name", "price",
+              sqlite_where=TAXED, postgresql_where=TAXED),
+        Index("ix_items_untaxed_name_price", "name", "price",
+              sqlite_where=UNTAXED, postgresql_where=UNTAXED),
+    )
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, DateTime, String
+from app.database import Base
+
+class RevokedTokenDB(Base):
+    """
+    SQLAlchemy model for revoked JWTs, keyed by their `jti` claim.
+    Rows are only needed until the token would have expired anyway.
+    """
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String, primary_key=True)
+    # Naive UTC timestamps
+    expires_at = Column(DateTime, nullable=False, index=True)
+    revoked_at = Column(DateTime, nullable=False, index=True)
@@ -13,3 +13,6 @@ class UserDB(Base):
     full_name = Column(String, nullable=True)
     hashed_password = Column(String)
     disabled = Column(Boolean, default=False)
+    # Number of items owned, maintained in the same transaction as item
+    # inserts/deletes so the per-user quota check never needs COUNT(*)
+    item_count = Column(Integer, nullable=False, default=0, server_default="0")
@@ -0,0 +1,146 @@
+"""
+Vectorized quote computation for carts of (item_id, quantity) lines.
+
+Money is handled in integer cents. Unit prices and per-unit taxes are rounded
+half-up to cents once, then every line is an exact int64 multiply and the
+totals are exact integer sums, so no float error accumulates over 100k lines.
+Amounts are bounded by `MAX_CENTS` so those multiplies and sums can't
+overflow int64, and converting back to floats stays exact to the cent.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+# Largest amount in cents a float64 holds exactly (about 90 trillion)
+MAX_CENTS = 2**53
+
+
+class QuoteTooLarge(ValueError):
+    """A line or total would exceed `MAX_CENTS`."""
+
+
+def in_range(amounts: np.ndarray) -> np.ndarray:
+    """Mask of amounts that are finite and convert to at most `MAX_CENTS`."""
+    with np.errstate(invalid="ignore"):
+        return np.isfinite(amounts) & (np.abs(amounts) * 100 < MAX_CENTS)
+
+
+def to_cents(amounts) -> np.ndarray:
+    """Round float amounts half-up to integer cents."""
+    amounts = np.asarray(amounts, dtype=np.float64)
+    if not in_range(amounts).all():
+        # NaN (e.g. a NULL price) would cast to INT64_MIN
+        raise ValueError("Amounts must be finite and within MAX_CENTS")
+    # Rounding at 6 places first absorbs binary noise, e.g. 1.005 * 100
+    # is 100.49999999999999 and should round to 101, not 100.
+    scaled = np.round(amounts * 100, 6)
+    return np.floor(scaled + 0.5).astype(np.int64)
+
+
+def _amounts(cents: np.ndarray) -> list[float]:
+    # cents / 100 is the float closest to the exact decimal amount
+    return (cents / 100).tolist()
+
+
+@dataclass
+class Quote:
+    """Per-line and total amounts, all in integer cents."""
+    item_ids: np.ndarray
+    quantities: np.ndarray
+    unit_price: np.ndarray
+    unit_tax: np.ndarray
+    subtotal: np.ndarray
+    tax: np.ndarray
+    missing: list[int]
+    unpriced: list[int]
+
+    @property
+    def total(self) -> np.ndarray:
+        return self.subtotal + self.tax
+
+    def as_dict(self, include_lines: bool = True) -> dict:
+        subtotal, tax = int(self.subtotal.sum()), int(self.tax.sum())
+        result = {
+            "subtotal": subtotal / 100,
+            "tax": tax / 100,
+            "total": (subtotal + tax) / 100,
+            "line_count": len(self.item_ids),
+        }
+        if include_lines:
+            result["lines"] = [
+                {
+                    "item_id": id,
+                    "quantity": qty,
+                    "unit_price": price,
+                    "subtotal": subtotal,
+                    "tax": tax,
+                    "total": total,
+                }
+                for id, qty, price, subtotal, tax, total in zip(
+                    self.item_ids.tolist(),
+                    self.quantities.tolist(),
+                    _amounts(self.unit_price),
+                    _amounts(self.subtotal),
+                    _amounts(self.tax),
+                    _amounts(self.total),
+                )
+            ]
+        return result
+
+
+def compute_quote(item_ids, quantities, catalog: np.ndarray) -> Quote:
+    """
+    Price every line against `catalog`, an (n, 3) array of
+    (id, price, tax) rows as loaded by `ItemRepository.get_price_rows`.
+
+    Lines are matched to catalog rows with one searchsorted over the sorted
+    catalog ids, so the whole quote is a handful of array passes regardless
+    of how many lines or distinct items it has. Ids missing from the catalog
+    are returned in `missing`, ids whose price or tax is NULL (NaN) or out of
+    range in `unpriced`; lines for either are priced at zero.
+    Raises QuoteTooLarge if a line or total would exceed `MAX_CENTS`.
+    """
+    ids = np.asarray(item_ids, dtype=np.int64)
+    qty = np.asarray(quantities, dtype=np.int64)
+    catalog = np.asarray(catalog, dtype=np.float64).reshape(-1, 3)
+
+    order = np.argsort(catalog[:, 0], kind="stable")
+    catalog_ids = catalog[order, 0].astype(np.int64)
+    priced = in_range(catalog[order, 1]) & in_range(catalog[order, 2])
+    price_cents = np.zeros(len(order), dtype=np.int64)
+    tax_cents = np.zeros(len(order), dtype=np.int64)
+    price_cents[priced] = to_cents(catalog[order, 1][priced])
+    tax_cents[priced] = to_cents(catalog[order, 2][priced])
+
+    pos = np.searchsorted(catalog_ids, ids)
+    found = np.zeros(len(ids), dtype=bool)
+    matched = pos < len(catalog_ids)
+    found[matched] = catalog_ids[pos[matched]] == ids[matched]
+    unpriced = found.copy()
+    unpriced[found] = ~priced[pos[found]]
+
+    unit_price = np.zeros(len(ids), dtype=np.int64)
+    unit_tax = np.zeros(len(ids), dtype=np.int64)
+    unit_price[found] = price_cents[pos[found]]
+    unit_tax[found] = tax_cents[pos[found]]
+
+    # Unit amounts are below MAX_CENTS (2**53), so comparing them against
+    # MAX_CENTS // |qty| catches any line that would overflow
+    limit = MAX_CENTS // np.maximum(np.abs(qty), 1)
+    if (np.abs(unit_price) + np.abs(unit_tax) > limit).any():
+        raise QuoteTooLarge("A line total exceeds the supported amount")
+    subtotal, tax = unit_price * qty, unit_tax * qty
+    # Each line total is below 2**53, so a float64 sum is accurate enough
+    # to tell whether the exact int64 sums could overflow
+    if np.abs(subtotal + tax).sum(dtype=np.float64) >= MAX_CENTS:
+        raise QuoteTooLarge("The quote total exceeds the supported amount")
+    return Quote(
+        item_ids=ids,
+        quantities=qty,
+        unit_price=unit_price,
+        unit_tax=unit_tax,
+        subtotal=subtotal,
+        tax=tax,
+        missing=np.unique(ids[~found]).tolist(),
+        unpriced=np.unique(ids[unpriced]).tolist(),
+    )
@@ -0,0 +1,257 @@
+import math
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Literal
+
+from fastapi import HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """A token bucket holding `limit` tokens that refills fully every `period` seconds."""
+    limit: int
+    period: float
+
+    @classmethod
+    def parse(cls, spec: str) -> "RateLimitRule":
+        """Parse specs like `5/minute` or `100/hour`."""
+        count, _, unit = spec.partition("/")
+        unit = unit.strip().rstrip("s")
+        if unit not in _PERIODS or not count.strip().isdigit():
+            raise ValueError(f"Invalid rate limit {spec!r}, expected e.g. '5/minute'")
+        return cls(limit=int(count), period=_PERIODS[unit])
+
+    @property
+    def rate(self) -> float:
+        return self.limit / self.period
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float
+    retry_after: float
+
+    @property
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(max(1, math.ceil(self.reset_after))),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+def _refill(tokens: float, elapsed: float, rule: RateLimitRule) -> tuple[float, RateLimitResult]:
+    tokens = min(rule.limit, tokens + max(elapsed, 0.0) * rule.rate)
+    allowed = tokens >= 1
+    if allowed:
+        tokens -= 1
+    result = RateLimitResult(
+        allowed=allowed,
+        limit=rule.limit,
+        remaining=int(tokens),
+        reset_after=(rule.limit - tokens) / rule.rate,
+        retry_after=0.0 if allowed else (1 - tokens) / rule.rate,
+    )
+    return tokens, result
+
+
+# ==================== Stores ====================
+class MemoryBucketStore:
+    """
+    Per-process token buckets, sharded so concurrent threads rarely contend
+    on the same lock. Each bucket stores when it will have refilled
+    completely, which depends on its own rule; from then on it is the same
+    as no bucket and can be dropped.
+
+    A shard is swept for such buckets once it grows past its threshold,
+    `max_keys_per_shard` or twice the size the previous sweep left behind,
+    whichever is larger. Every sweep is paid for by as many new keys as it
+    scans, so eviction costs O(1) amortized per take.
+    """
+    blocking = False
+
+    def __init__(self, shards: int = 16, max_keys_per_shard: int = 10_000):
+        self.max_keys_per_shard = max_keys_per_shard
+        # key -> (tokens, updated, full_at)
+        self._shards: list[dict[str, tuple[float, float, float]]] = [{} for _ in range(shards)]
+        self._sweep_at = [max_keys_per_shard] * shards
+        self._locks = [threading.Lock() for _ in range(shards)]
+
+    def take(self, key: str, rule: RateLimitRule) -> RateLimitResult:
+        index = zlib.crc32(key.encode()) % len(self._shards)
+        shard = self._shards[index]
+        with self._locks[index]:
+            now = time.monotonic()
+            tokens, updated, _ = shard.get(key, (rule.limit, now, now))
+            tokens, result = _refill(tokens, now - updated, rule)
+            shard[key] = (tokens, now, now + result.reset_after)
+            if len(shard) > self._sweep_at[index]:
+                self._evict(shard, now)
+                self._sweep_at[index] = max(self.max_keys_per_shard, 2 * len(shard))
+        return result
+
+    @staticmethod
+    def _evict(shard: dict, now: float) -> None:
+        for key, (_, _, full_at) in list(shard.items()):
+            if full_at <= now:
+                del shard[key]
+
+    def reset(self) -> None:
+        for lock, shard in zip(self._locks, self._shards):
+            with lock:
+                shard.clear()
+        self._sweep_at = [self.max_keys_per_shard] * len(self._shards)
+
+
+class SQLiteBucketStore:
+    """
+    Token buckets in a local SQLite file so every worker process on the host
+    shares the same limits. Each take is one short IMMEDIATE transaction.
+
+    Rows record when their bucket will have refilled completely (`full_at`).
+    At most once per `purge_seconds` a take also deletes the rows past that
+    point through an index on `full_at`, so the table stays bounded by the
+    keys seen within the longest period.
+    """
+    blocking = True
+
+    def __init__(self, path: str, purge_seconds: float = 60.0):
+        self.path = path
+        self.purge_seconds = purge_seconds
+        self._purge_at = 0.0
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_buckets (key TEXT PRIMARY KEY, "
+                "tokens REAL NOT NULL, updated REAL NOT NULL, full_at REAL NOT NULL DEFAULT 0)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(rate_limit_buckets)")}
+            if "full_at" not in columns:
+                # Files from before full_at: their rows go with the first purge
+                conn.execute(
+                    "ALTER TABLE rate_limit_buckets ADD COLUMN full_at REAL NOT NULL DEFAULT 0"
+                )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_rate_limit_buckets_full_at "
+                "ON rate_limit_buckets (full_at)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, rule: RateLimitRule) -> RateLimitResult:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Wall-clock time: monotonic clocks aren't comparable across processes
+            now = time.time()
+            row = conn.execute(
+                "SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens, updated = row if row else (rule.limit, now)
+            tokens, result = _refill(tokens, now - updated, rule)
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated, full_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, tokens, now, now + result.reset_after),
+            )
+            if now >= self._purge_at:
+                self._purge_at = now + self.purge_seconds
+                conn.execute("DELETE FROM rate_limit_buckets WHERE full_at <= ?", (now,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+
+    def reset(self) -> None:
+        self._conn().execute("DELETE FROM rate_limit_buckets")
+
+
+# ==================== Limiter ====================
+class RateLimiter:
+    """Applies the per-scope rules from Settings to a bucket store."""
+
+    def __init__(self, store, rules: dict[str, str], enabled: bool = True):
+        self.store = store
+        self.rules = {scope: RateLimitRule.parse(spec) for scope, spec in rules.items()}
+        self.enabled = enabled
+
+    async def hit(self, scope: str, key: str) -> RateLimitResult | None:
+        rule = self.rules.get(scope)
+        if not self.enabled or rule is None:
+            return None
+        bucket = f"{scope}:{key}"
+        if self.store.blocking:
+            return await run_in_threadpool(self.store.take, bucket, rule)
+        return self.store.take(bucket, rule)
+
+    def reset(self) -> None:
+        self.store.reset()
+
+
+def _create_store():
+    if settings.rate_limit_backend == "sqlite":
+        return SQLiteBucketStore(settings.rate_limit_sqlite_path)
+    return MemoryBucketStore()
+
+
+rate_limiter = RateLimiter(
+    _create_store(), settings.rate_limits, enabled=settings.rate_limit_enabled
+)
+
+
+def _client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+def rate_limit(scope: str, by: Literal["ip", "username", "route"] = "ip"):
+    """
+    Dependency factory enforcing the `scope` rule from `Settings.rate_limits`.
+
+    `by` picks the bucket key: the client IP, the submitted form username
+    (for login endpoints), or the route itself (one bucket for everyone).
+    Exceeding the limit raises 429 with `Retry-After`; allowed responses
+    carry `RateLimit-*` headers for the most restrictive limit applied.
+    """
+    async def dependency(request: Request, response: Response):
+        if by == "username":
+            form = await request.form()
+            key = str(form.get("username", "")).casefold()
+        elif by == "route":
+            key = request.scope["route"].path
+        else:
+            key = _client_ip(request)
+
+        result = await rate_limiter.hit(scope, key)
+        if result is None:
+            return
+        if not result.allowed:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests",
+                headers=result.headers,
+            )
+        current = response.headers.get("RateLimit-Remaining")
+        if current is None or result.remaining < int(current):
+            response.headers.update(result.headers)
+
+    return dependency
@@ -1,2 +1,4 @@
 from .item import ItemRepository
 from .user import UserRepository
+from .loader import BatchLoader
+from .changes import ChangeLogRepository
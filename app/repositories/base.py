@@ -1,9 +1,15 @@
+from datetime import datetime, timezone
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
-from typing import TypeVar, Generic, Type, Any
+from typing import TypeVar, Generic, Type, Any, Iterable
+from app.models.change import ChangeLogDB, ChangeLogHeadDB
 
 T = TypeVar("T")
 
 class BaseRepository(Generic[T]):
+    # Subclasses set this to record their writes in the change log
+    change_log_entity: str | None = None
+
     def __init__(self, model: Type[T], db: Session):
         self.model = model
         self.db = db
@@ -11,29 +17,103 @@ class BaseRepository(Generic[T]):
     def get_by_id(self, id: Any) -> T | None:
         return self.db.query(self.model).filter(self.model.id == id).first()
 
+    def get_many(self, ids: Iterable[Any]) -> tuple[list[T], list[Any]]:
+        """
+        Fetch several rows with a single IN query.
+        Returns the found objects in request order (duplicates collapsed)
+        and the ids that don't exist.
+        """
+        wanted = list(dict.fromkeys(ids))
+        if not wanted:
+            return [], []
+        rows = self.db.query(self.model).filter(self.model.id.in_(wanted)).all()
+        by_id = {row.id: row for row in rows}
+        found = [by_id[id] for id in wanted if id in by_id]
+        missing = [id for id in wanted if id not in by_id]
+        return found, missing
+
     def get_all(self, skip: int = 0, limit: int = 100) -> list[T]:
         return self.db.query(self.model).offset(skip).limit(limit).all()
 
     def create(self, obj_in: dict) -> T:
         db_obj = self.model(**obj_in)
         self.db.add(db_obj)
+        self.before_commit("created", db_obj)
+        self._log_change("created", db_obj)
         self.db.commit()
         self.db.refresh(db_obj)
+        self.after_write("created", db_obj)
         return db_obj
 
     def delete(self, id: Any) -> bool:
         db_obj = self.get_by_id(id)
         if db_obj:
-            self.db.delete(db_obj)
-            self.db.commit()
+            self.delete_obj(db_obj)
             return True
         return False
 
+    def delete_obj(self, db_obj: T) -> None:
+        self.db.delete(db_obj)
+        self.before_commit("deleted", db_obj)
+        self._log_change("deleted", db_obj)
+        self.db.commit()
+        self.after_write("deleted", db_obj)
+
     def update(self, db_obj: T, obj_in: dict) -> T:
         for field, value in obj_in.items():
             if hasattr(db_obj, field):
                 setattr(db_obj, field, value)
         self.db.add(db_obj)
+        self.before_commit("updated", db_obj)
+        self._log_change("updated", db_obj)
         self.db.commit()
         self.db.refresh(db_obj)
+        self.after_write("updated", db_obj)
         return db_obj
+
+    def _log_change(self, action: str, db_obj: T) -> None:
+        """
+        Append the write to the change log inside the write's transaction.
+        The sequence number comes from an UPDATE of the single head row; its
+        row lock is held until commit, so sequence order is commit order and
+        a reader never sees seq N+1 before seq N.
+
+        The head row is locked last, after `before_commit` and the write's own
+        rows, so every write takes its locks in the same order and two writes
+        can't deadlock on the head row and e.g. the owner's users row.
+        """
+        if self.change_log_entity is None:
+            return
+        # Flush the write itself (and assign a new row's id) before the head
+        self.db.flush()
+        seq = self.db.execute(
+            update(ChangeLogHeadDB)
+            .where(ChangeLogHeadDB.id == 1)
+            .values(seq=ChangeLogHeadDB.seq + 1)
+            .returning(ChangeLogHeadDB.seq)
+        ).scalar_one()
+        self.db.execute(insert(ChangeLogDB).values(
+            seq=seq,
+            entity=self.change_log_entity,
+            entity_id=db_obj.id,
+            action=action,
+            data=None if action == "deleted" else self.change_data(db_obj),
+            created_at=datetime.now(timezone.utc).replace(tzinfo=None),
+        ))
+
+    def change_data(self, db_obj: T) -> dict | None:
+        """Snapshot of the object stored with created/updated log entries."""
+        return None
+
+    def before_commit(self, action: str, db_obj: T) -> None:
+        """
+        Hook called inside the write's transaction, just before commit.
+        Subclasses override it for bookkeeping that must commit atomically
+        with the write (counters, audit rows).
+        """
+
+    def after_write(self, action: str, db_obj: T) -> None:
+        """
+        Hook called after a create, update or delete has been committed.
+        Subclasses override it to invalidate caches or notify listeners.
+        """
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+from app.repositories.base import BaseRepository
+from app.models.change import ChangeLogDB, ChangeLogHeadDB
+
+class ChangeLogRepository(BaseRepository[ChangeLogDB]):
+    def __init__(self, db: Session):
+        super().__init__(ChangeLogDB, db)
+
+    def head(self) -> ChangeLogHeadDB:
+        return self.db.execute(select(ChangeLogHeadDB).where(ChangeLogHeadDB.id == 1)).scalar_one()
+
+    def compacted_seq(self) -> int:
+        """Highest seq removed by compaction, read fresh from the database."""
+        return self.db.execute(
+            select(ChangeLogHeadDB.compacted_seq).where(ChangeLogHeadDB.id == 1)
+        ).scalar_one()
+
+    def since(self, entity: str, since: int, limit: int) -> list[ChangeLogDB]:
+        """Up to `limit` changes to `entity` with seq > `since`, oldest first."""
+        stmt = (
+            select(ChangeLogDB)
+            .where(ChangeLogDB.seq > since, ChangeLogDB.entity == entity)
+            .order_by(ChangeLogDB.seq)
+            .limit(limit)
+        )
+        return list(self.db.execute(stmt).scalars())
+
+    def compact(self, max_entries: int, retention: timedelta) -> int:
+        """
+        Drop entries beyond the newest `max_entries` or older than `retention`,
+        and advance `compacted_seq` so clients behind it know to resync.
+        Returns the number of entries removed.
+        """
+        head = self.db.execute(
+            select(ChangeLogHeadDB.seq).where(ChangeLogHeadDB.id == 1)
+        ).scalar_one()
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - retention
+        newest_expired = self.db.execute(
+            select(func.max(ChangeLogDB.seq)).where(ChangeLogDB.created_at < cutoff)
+        ).scalar() or 0
+        through = max(head - max_entries, newest_expired)
+        if through <= 0:
+            return 0
+        removed = self.db.execute(delete(ChangeLogDB).where(ChangeLogDB.seq <= through)).rowcount
+        self.db.execute(
+            update(ChangeLogHeadDB)
+            .where(ChangeLogHeadDB.id == 1, ChangeLogHeadDB.compacted_seq < through)
+            .values(compacted_seq=through)
+        )
+        self.db.commit()
+        return removed
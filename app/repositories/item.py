@@ -1,8 +1,32 @@
+import logging
+
+from sqlalchemy import func, select, update
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from app.repositories.base import BaseRepository
 from app.models.item import ItemDB
+from app.models.user import UserDB
+from app.cache import item_search_cache
+from app.suggest import item_name_index
+from app.events import item_events
+
+logger = logging.getLogger("api_logger")
 
 class ItemRepository(BaseRepository[ItemDB]):
+    # Columns needed to build an ItemPublic response. Selecting them directly
+    # returns plain row tuples that never enter the session identity map.
+    public_columns = (ItemDB.name, ItemDB.price, ItemDB.description)
+
+    # ORDER BY clauses for each supported sort; each one follows the column
+    # order of a composite index so the database reads rows pre-sorted.
+    sort_orders = {
+        "price": (ItemDB.price, ItemDB.name),
+        "-price": (ItemDB.price.desc(), ItemDB.name.desc()),
+        "name": (ItemDB.name, ItemDB.price),
+    }
+
+    change_log_entity = "item"
+
     def __init__(self, db: Session):
         super().__init__(ItemDB, db)
 
@@ -11,3 +35,115 @@ class ItemRepository(BaseRepository[ItemDB]):
         if q:
             query = query.filter(self.model.name.contains(q))
         return query.all()
+
+    def _select_public(self, fields: list[str] | None = None):
+        if fields:
+            return select(*(getattr(self.model, field) for field in fields))
+        return select(*self.public_columns)
+
+    def search_rows(
+        self,
+        q: str | None = None,
+        fields: list[str] | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        has_tax: bool | None = None,
+        sort: str | None = None,
+    ) -> list[Row]:
+        """
+        Read-only variant of `search` for list endpoints.
+        Returns lightweight rows (name, price, description) instead of ORM objects.
+        `fields` narrows the SELECT list to a subset of those columns.
+        Price/tax filters and `sort` are shaped to match the composite indexes
+        on ItemDB (see `sort_orders`).
+        """
+        stmt = self._select_public(fields)
+        if q:
+            stmt = stmt.where(self.model.name.contains(q))
+        if min_price is not None:
+            stmt = stmt.where(self.model.price >= min_price)
+        if max_price is not None:
+            stmt = stmt.where(self.model.price <= max_price)
+        if has_tax is not None:
+            stmt = stmt.where(self.model.tax.is_not(None) if has_tax else self.model.tax.is_(None))
+        if sort:
+            stmt = stmt.order_by(*self.sort_orders[sort])
+        return list(self.db.execute(stmt).all())
+
+    def get_row_by_id(self, id: int, fields: list[str] | None = None) -> Row | None:
+        """Read-only single-item lookup returning a lightweight row."""
+        stmt = self._select_public(fields).where(self.model.id == id)
+        return self.db.execute(stmt).first()
+
+    def list_rows_by_owner(self, owner_id: int) -> list[Row]:
+        """Items owned by a user, via the owner_id index."""
+        stmt = select(*self.public_columns).where(self.model.owner_id == owner_id)
+        return list(self.db.execute(stmt.order_by(self.model.id)).all())
+
+    def get_price_rows(self, ids, chunk_size: int = 10_000) -> list[tuple]:
+        """
+        (id, price, tax) for the given ids, with a missing tax read as 0
+        and a missing price left as None.
+        One IN query per `chunk_size` distinct ids (a single query for any
+        normal cart), keeping large requests under driver parameter limits.
+        """
+        wanted = list(dict.fromkeys(ids))
+        stmt = select(self.model.id, self.model.price, func.coalesce(self.model.tax, 0.0))
+        rows: list[tuple] = []
+        for start in range(0, len(wanted), chunk_size):
+            chunk = wanted[start:start + chunk_size]
+            # Plain tuples: NumPy converts Row objects about 5x slower
+            rows.extend(map(tuple, self.db.execute(stmt.where(self.model.id.in_(chunk))).all()))
+        return rows
+
+    def create_owned(self, obj_in: dict, owner_id: int, quota: int) -> ItemDB | None:
+        """
+        Create an item for `owner_id` unless they already own `quota` items.
+
+        The owner's item_count is bumped with a conditional UPDATE in the same
+        transaction as the INSERT. The row lock it takes serializes concurrent
+        creates for the same user, so the quota holds without COUNT(*).
+        Returns None when the quota is reached.
+        """
+        result = self.db.execute(
+            update(UserDB)
+            .where(UserDB.id == owner_id, UserDB.item_count < quota)
+            .values(item_count=UserDB.item_count + 1)
+        )
+        if result.rowcount == 0:
+            self.db.rollback()
+            return None
+        return self.create({**obj_in, "owner_id": owner_id})
+
+    def before_commit(self, action: str, db_obj: ItemDB) -> None:
+        if action == "deleted" and db_obj.owner_id is not None:
+            self.db.execute(
+                update(UserDB)
+                .where(UserDB.id == db_obj.owner_id)
+                .values(item_count=UserDB.item_count - 1)
+            )
+
+    def after_write(self, action: str, db_obj: ItemDB) -> None:
+        # The write is committed: a failing side effect is logged, not raised,
+        # and doesn't stop the others. Each has its own catch-up path (cache
+        # TTL, index sync from the change log, delta sync for subscribers).
+        id = db_obj.id
+        try:
+            item_search_cache.invalidate()
+        except Exception:
+            logger.exception(f"Search cache invalidation failed after item {action} id={id}")
+        try:
+            if action == "deleted":
+                item_name_index.remove(id)
+            else:
+                item_name_index.add(id, db_obj.name)
+        except Exception:
+            logger.exception(f"Suggest index update failed after item {action} id={id}")
+        try:
+            payload = {"id": id} if action == "deleted" else {"id": id, "item": self.change_data(db_obj)}
+            item_events.publish(f"item.{action}", payload)
+        except Exception:
+            logger.exception(f"Event publish failed after item {action} id={id}")
+
+    def change_data(self, db_obj: ItemDB) -> dict:
+        return {column.key: getattr(db_obj, column.key) for column in self.public_columns}
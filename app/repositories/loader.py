@@ -0,0 +1,44 @@
+from typing import Any, Generic, TypeVar
+
+from app.repositories.base import BaseRepository
+
+T = TypeVar("T")
+
+class BatchLoader(Generic[T]):
+    """
+    Request-scoped loader that merges individual id lookups into one query.
+
+    Code paths call `prefetch` with ids they will need; the first `load`
+    resolves everything queued so far through `BaseRepository.get_many`.
+    Results (including misses) are memoized for the rest of the request.
+    """
+
+    def __init__(self, repo: BaseRepository[T]):
+        self.repo = repo
+        self._cache: dict[Any, T | None] = {}
+        self._pending: dict[Any, None] = {}
+
+    def prefetch(self, *ids: Any) -> None:
+        for id in ids:
+            if id not in self._cache:
+                self._pending[id] = None
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        ids, self._pending = list(self._pending), {}
+        found, missing = self.repo.get_many(ids)
+        for obj in found:
+            self._cache[obj.id] = obj
+        for id in missing:
+            self._cache[id] = None
+
+    def load(self, id: Any) -> T | None:
+        self.prefetch(id)
+        self.flush()
+        return self._cache[id]
+
+    def load_many(self, ids: list[Any]) -> list[T | None]:
+        self.prefetch(*ids)
+        self.flush()
+        return [self._cache[id] for id in ids]
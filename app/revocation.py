@@ -0,0 +1,201 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.token import RevokedTokenDB
+
+
+def utcnow() -> datetime:
+    """Naive UTC now, matching the DateTime columns of revoked_tokens."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings. Membership tests never give false
+    negatives; false positives occur at about `error_rate` while no more than
+    `capacity` keys have been added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = max(capacity, 1)
+        self.size = max(64, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        # Double hashing: k positions from one 128-bit digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class RevocationList:
+    """
+    Revoked token ids (`jti`) with a Bloom filter in front of the database.
+
+    A token missing from the filter is definitely not revoked, so the common
+    case costs no query. Filter hits (real revocations plus the occasional
+    false positive) are confirmed with a primary-key lookup.
+
+    Every worker holds its own filter. It is rebuilt from the revoked_tokens
+    table, then topped up every `sync_interval` seconds with rows revoked
+    since the previous sync, so revocations made in another worker take
+    effect within one interval. Periodic rebuilds drop expired entries.
+    Only one thread refreshes at a time; others keep using the current
+    filter meanwhile. Async callers use `is_revoked_async`, which runs the
+    refresh and any database lookup in the threadpool.
+    """
+
+    # Re-read rows revoked shortly before the last sync, covering
+    # transactions that committed after it with an earlier timestamp
+    sync_overlap = timedelta(seconds=5)
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+        sync_interval: float,
+        rebuild_interval: float,
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self._filter: BloomFilter | None = None
+        self._synced_until = datetime.min
+        self._next_sync = 0.0
+        self._next_rebuild = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self.db_checks = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._filter is not None
+
+    # ==================== Building & Syncing ====================
+    def rebuild(self, db: Session) -> None:
+        """Replace the filter with one holding every unexpired revocation."""
+        now = utcnow()
+        jtis = db.execute(
+            select(RevokedTokenDB.jti).where(RevokedTokenDB.expires_at > now)
+        ).scalars().all()
+        bloom = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate)
+        for jti in jtis:
+            bloom.add(jti)
+        with self._lock:
+            self._filter = bloom
+            self._synced_until = now
+            self._next_sync = time.monotonic() + self.sync_interval
+            self._next_rebuild = time.monotonic() + self.rebuild_interval
+
+    def sync(self, db: Session) -> None:
+        """Add revocations recorded (by any worker) since the last sync."""
+        now = utcnow()
+        jtis = db.execute(
+            select(RevokedTokenDB.jti).where(
+                RevokedTokenDB.revoked_at >= self._synced_until - self.sync_overlap
+            )
+        ).scalars().all()
+        with self._lock:
+            for jti in jtis:
+                self._filter.add(jti)
+            self._synced_until = now
+            self._next_sync = time.monotonic() + self.sync_interval
+            if self._filter.count > self._filter.capacity:
+                self._next_rebuild = 0.0  # over capacity: resize on next check
+
+    @property
+    def refresh_due(self) -> bool:
+        return self._filter is None or time.monotonic() >= min(self._next_sync, self._next_rebuild)
+
+    def refresh(self, db: Session) -> None:
+        """Build, sync or rebuild the filter if it is due."""
+        # Without a filter wait for whoever is building it; otherwise leave
+        # the refresh to the thread already doing it
+        if not self._refresh_lock.acquire(blocking=self._filter is None):
+            return
+        try:
+            now = time.monotonic()
+            if self._filter is None or now >= self._next_rebuild:
+                self.rebuild(db)
+            elif now >= self._next_sync:
+                self.sync(db)
+        finally:
+            self._refresh_lock.release()
+
+    # ==================== Checks & Updates ====================
+    def is_revoked(self, db: Session, jti: str) -> bool:
+        self.refresh(db)
+        return jti in self._filter and self._confirm(db, jti)
+
+    async def is_revoked_async(self, db: Session, jti: str) -> bool:
+        """`is_revoked` for the event loop: only the filter lookup runs on it."""
+        if self.refresh_due:
+            await run_in_threadpool(self.refresh, db)
+        return jti in self._filter and await run_in_threadpool(self._confirm, db, jti)
+
+    def _confirm(self, db: Session, jti: str) -> bool:
+        """Rule out a Bloom filter false positive."""
+        self.db_checks += 1
+        stmt = select(RevokedTokenDB.jti).where(RevokedTokenDB.jti == jti)
+        return db.execute(stmt).first() is not None
+
+    def revoke(self, db: Session, jti: str, expires_at: datetime) -> bool:
+        """
+        Record a revocation and purge ones past their token's expiry.
+        Returns False if the token was already revoked.
+        """
+        now = utcnow()
+        if db.get(RevokedTokenDB, jti) is not None:
+            return False
+        db.add(RevokedTokenDB(jti=jti, expires_at=expires_at, revoked_at=now))
+        db.execute(delete(RevokedTokenDB).where(RevokedTokenDB.expires_at <= now))
+        try:
+            db.commit()
+        except IntegrityError:
+            # Revoked concurrently by another request (e.g. a replayed refresh)
+            db.rollback()
+            return False
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(jti)
+        return True
+
+    def stats(self) -> dict:
+        bloom = self._filter
+        return {
+            "ready": bloom is not None,
+            "entries": bloom.count if bloom else 0,
+            "capacity": bloom.capacity if bloom else self.capacity,
+            "bits": bloom.size if bloom else 0,
+            "hashes": bloom.hashes if bloom else 0,
+            "db_checks": self.db_checks,
+        }
+
+
+revocation_list = RevocationList(
+    capacity=settings.revocation_bloom_capacity,
+    error_rate=settings.revocation_bloom_error_rate,
+    sync_interval=settings.revocation_sync_seconds,
+    rebuild_interval=settings.revocation_rebuild_seconds,
+)
@@ -1,42 +1,277 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Annotated
+from typing import Annotated, Literal
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_read_db, get_write_db
 import app.models as models
-from app.schemas.item import ItemCreate, ItemUpdate, ItemResponse, ItemPublic
-from app.dependencies import get_current_user
+from app.schemas.item import (
+    ItemCreate,
+    ItemUpdate,
+    ItemResponse,
+    ItemPublic,
+    ItemBatchRequest,
+    ItemBatchResponse,
+    QuoteRequest,
+    QuoteResponse,
+    ItemChangesResponse,
+)
+from app.dependencies import get_current_user, get_item_loader
 from app.schemas.user import User
 
-from app.repositories import ItemRepository
+from app.repositories import BatchLoader, ChangeLogRepository, ItemRepository
+from app.cache import item_search_cache
+from app.deadlines import without_deadline
+from app.suggest import item_name_index
+from app.ratelimit import rate_limit
+from app.quote import QuoteTooLarge, compute_quote
+from app.events import item_events, sse_stream
 
 router = APIRouter(
     prefix="/items",
     tags=["items"],
 )
 
+limit_writes = [Depends(rate_limit("item_writes"))]
+
+def get_item_fields(
+    fields: str | None = Query(
+        None,
+        title="Sparse Fieldset",
+        description="Comma-separated subset of item fields to return, e.g. `name,price`",
+    )
+) -> list[str] | None:
+    """
+    Dependency that parses and validates the `fields` query parameter
+    against the public item schema.
+    """
+    if fields is None:
+        return None
+    requested = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in ItemPublic.model_fields]
+    if not requested or unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Invalid fields: {', '.join(unknown) or fields!r}. "
+                   f"Allowed: {', '.join(ItemPublic.model_fields)}",
+        )
+    return requested
+
+
 @router.get("/", response_model=list[ItemPublic])
 async def read_items(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
+    fields: Annotated[list[str] | None, Depends(get_item_fields)],
     q: str | None = Query(
         None,
         min_length=3,
         max_length=50,
         title="Search Query",
         description="Search for items in the database",
-    )
+    ),
+    min_price: float | None = Query(None, ge=0, description="Lowest price to include"),
+    max_price: float | None = Query(None, ge=0, description="Highest price to include"),
+    has_tax: bool | None = Query(None, description="Only items with (true) or without (false) tax"),
+    sort: Literal["price", "-price", "name"] | None = Query(
+        None, description="Sort order; prefix with `-` for descending"
+    ),
 ):
-    repo = ItemRepository(db)
-    return repo.search(q)
+    # Identical concurrent searches share one DB call, and results are
+    # micro-cached until the TTL expires or an item is written. Keyed by
+    # database too: a client sticky to the primary must not be served a
+    # result loaded from a lagging replica.
+    filters = dict(min_price=min_price, max_price=max_price, has_tax=has_tax, sort=sort)
+    bind = db.get_bind()
+    key = (str(bind.url), q or None, tuple(fields or ()), *filters.values())
+
+    def load():
+        # The load is shared with other requests, so it gets its own session
+        # and isn't bound by this request's deadline: if this request gives
+        # up first, the others still get their results.
+        with Session(bind) as session:
+            return ItemRepository(session).search_rows(q, fields, **filters)
 
+    rows = await item_search_cache.get_or_load(key, lambda: run_in_threadpool(without_deadline, load))
+    if fields:
+        # Partial items don't satisfy ItemPublic, so skip response_model validation
+        return JSONResponse(content=[row._asdict() for row in rows])
+    return rows
 
-@router.post("/", response_model=ItemResponse, status_code=201)
-def create_item(item: ItemCreate, db: Session = Depends(get_db)):
+
+@router.post("/", response_model=ItemResponse, status_code=201, dependencies=limit_writes)
+def create_item(
+    item: ItemCreate,
+    current_user: Annotated[models.UserDB, Depends(get_current_user)],
+    db: Session = Depends(get_write_db),
+):
+    """
+    Create an item owned by the authenticated user.
+    Fails with 403 once the user owns `items_per_user` items.
+    """
     repo = ItemRepository(db)
-    db_item = repo.create(item.dict())
+    db_item = repo.create_owned(item.dict(), current_user.id, settings.items_per_user)
+    if db_item is None:
+        raise HTTPException(
+            status_code=403,
+            detail=f"Item quota reached ({settings.items_per_user} items per user)",
+        )
     return {"message": "Item created", "item": db_item}
 
 
+@router.get("/suggest")
+def suggest_items(
+    prefix: str = Query(
+        ...,
+        min_length=1,
+        max_length=50,
+        title="Name Prefix",
+        description="Beginning of an item name, for type-ahead",
+    ),
+    limit: int = Query(10, ge=1, le=50),
+    fuzzy: bool = Query(False, description="Tolerate small typos in the prefix"),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Type-ahead suggestions served from the in-memory name index.
+    No database access, so this stays fast enough to call on every keystroke.
+    (In fast-start mode the first call builds the index; calls arriving
+    during that build get a 503 instead of building it again.)
+    """
+    if not item_name_index.ready and not item_name_index.try_build(db):
+        raise HTTPException(
+            status_code=503,
+            detail="Suggestions are warming up, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    return {
+        "prefix": prefix,
+        "suggestions": item_name_index.suggest(prefix, limit=limit, fuzzy=fuzzy),
+    }
+
+
+@router.get("/suggest/stats")
+def suggest_index_stats():
+    """Size and approximate memory usage of the autocomplete index."""
+    return item_name_index.memory_usage()
+
+
+@router.get("/stream")
+async def stream_item_events():
+    """
+    Live feed of `item.created`, `item.updated` and `item.deleted` events
+    as Server-Sent Events, so dashboards don't have to poll the item list.
+    Clients that fall too far behind get an `overflow` event and are
+    disconnected; they should reconnect and re-read the list.
+    """
+    return StreamingResponse(
+        sse_stream(item_events, settings.events_heartbeat_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/changes", response_model=ItemChangesResponse)
+def read_item_changes(
+    db: Annotated[Session, Depends(get_read_db)],
+    since: int = Query(0, ge=0, description="Last `seq` the client has applied"),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """
+    Delta sync: item changes after the client's checkpoint, oldest first.
+    Apply them in order and call again with `next_since` while `has_more`.
+    Answers 410 if the log was compacted past `since`; the client must then
+    re-download the catalog and continue from the `seq` it started at.
+    """
+    repo = ChangeLogRepository(db)
+    head = repo.head()
+    entries = repo.since(ItemRepository.change_log_entity, since, limit + 1)
+    # Checked after reading the entries: a compaction that ran in between
+    # may have removed some of them
+    compacted_seq = repo.compacted_seq()
+    if since < compacted_seq:
+        raise HTTPException(
+            status_code=410,
+            detail=f"Changes up to seq {compacted_seq} were compacted; full resync required",
+        )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    return {
+        "changes": [
+            {"seq": e.seq, "action": e.action, "id": e.entity_id, "item": e.data, "at": e.created_at}
+            for e in entries
+        ],
+        # Without more item changes, jump to the head (read before the
+        # entries) so other entities' entries aren't rescanned next time
+        "next_since": entries[-1].seq if has_more else max(since, head.seq, *(e.seq for e in entries[-1:])),
+        "has_more": has_more,
+    }
+
+
+def _batch_lookup(loader: BatchLoader, ids: list[int]) -> dict:
+    wanted = list(dict.fromkeys(ids))
+    loaded = loader.load_many(wanted)
+    return {
+        "items": [item for item in loaded if item is not None],
+        "missing": [id for id, item in zip(wanted, loaded) if item is None],
+    }
+
+
+@router.get("/batch", response_model=ItemBatchResponse)
+def read_items_batch(
+    loader: Annotated[BatchLoader, Depends(get_item_loader)],
+    ids: list[int] = Query(
+        ...,
+        min_length=1,
+        max_length=100,
+        title="Item IDs",
+        description="Repeat the parameter per id, e.g. `?ids=1&ids=2`. Use POST for long lists.",
+    ),
+):
+    """
+    Fetch many items in a single IN query.
+    Items come back in request order; unknown ids are listed in `missing`.
+    """
+    return _batch_lookup(loader, ids)
+
+
+@router.post("/batch", response_model=ItemBatchResponse)
+def read_items_batch_post(
+    batch: ItemBatchRequest, loader: Annotated[BatchLoader, Depends(get_item_loader)]
+):
+    """POST variant of the batch lookup for id lists too long for a query string."""
+    return _batch_lookup(loader, batch.ids)
+
+
+def _id_list(ids: list[int], shown: int = 20) -> str:
+    more = f" and {len(ids) - shown} more" if len(ids) > shown else ""
+    return ", ".join(map(str, ids[:shown])) + more
+
+
+@router.post("/quote", response_model=QuoteResponse)
+def quote_items(cart: QuoteRequest, db: Session = Depends(get_read_db)):
+    """
+    Price a cart of (item_id, quantity) lines.
+    Prices and taxes load in one query; line and grand totals are computed
+    in a single vectorized pass in integer cents. Set `include_lines` to
+    false to get only the totals for very large carts.
+    """
+    item_ids = [line.item_id for line in cart.lines]
+    quantities = [line.quantity for line in cart.lines]
+    catalog = ItemRepository(db).get_price_rows(item_ids)
+    try:
+        quote = compute_quote(item_ids, quantities, catalog)
+    except QuoteTooLarge as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    if quote.missing:
+        raise HTTPException(status_code=404, detail=f"Items not found: {_id_list(quote.missing)}")
+    if quote.unpriced:
+        raise HTTPException(status_code=409, detail=f"Items have no price: {_id_list(quote.unpriced)}")
+    # Already plain JSON types; skip re-validating up to 100k lines
+    return JSONResponse(content=quote.as_dict(cart.include_lines))
+
+
 @router.get("/secret")
 async def read_secret_items(current_user: Annotated[User, Depends(get_current_user)]):
     """
@@ -50,21 +285,39 @@ async def read_secret_items(current_user: Annotated[User, Depends(get_current_us
 
 
 @router.get("/{item_id}", response_model=ItemPublic)
-def read_item(item_id: int, db: Session = Depends(get_db)):
+def read_item(
+    item_id: int,
+    fields: Annotated[list[str] | None, Depends(get_item_fields)],
+    db: Session = Depends(get_read_db),
+):
     repo = ItemRepository(db)
-    item = repo.get_by_id(item_id)
+    item = repo.get_row_by_id(item_id, fields)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
+    if fields:
+        return JSONResponse(content=item._asdict())
     return item
 
 
-@router.patch("/{item_id}", response_model=ItemResponse)
-def update_item(item_id: int, item_update: ItemUpdate, db: Session = Depends(get_db)):
-    repo = ItemRepository(db)
+def _get_owned_item(repo: ItemRepository, item_id: int, user: models.UserDB) -> models.ItemDB:
     db_item = repo.get_by_id(item_id)
     if not db_item:
         raise HTTPException(status_code=404, detail="Item not found")
-    
+    if db_item.owner_id != user.id:
+        raise HTTPException(status_code=403, detail="Not the owner of this item")
+    return db_item
+
+
+@router.patch("/{item_id}", response_model=ItemResponse, dependencies=limit_writes)
+def update_item(
+    item_id: int,
+    item_update: ItemUpdate,
+    current_user: Annotated[models.UserDB, Depends(get_current_user)],
+    db: Session = Depends(get_write_db),
+):
+    repo = ItemRepository(db)
+    db_item = _get_owned_item(repo, item_id, current_user)
+
     # Update only the fields provided
     update_data = item_update.dict(exclude_unset=True)
     repo.update(db_item, update_data)
@@ -72,9 +325,12 @@ def update_item(item_id: int, item_update: ItemUpdate, db: Session = Depends(get
     return {"message": "Item updated", "item": db_item}
 
 
-@router.delete("/{item_id}")
-def delete_item(item_id: int, db: Session = Depends(get_db)):
+@router.delete("/{item_id}", dependencies=limit_writes)
+def delete_item(
+    item_id: int,
+    current_user: Annotated[models.UserDB, Depends(get_current_user)],
+    db: Session = Depends(get_write_db),
+):
     repo = ItemRepository(db)
-    if not repo.delete(item_id):
-        raise HTTPException(status_code=404, detail="Item not found")
+    repo.delete_obj(_get_owned_item(repo, item_id, current_user))
     return {"message": "Item deleted successfully"}
@@ -1,19 +1,59 @@
 from fastapi import APIRouter, Request, Form, File, UploadFile, Header, Cookie
-from fastapi.templating import Jinja2Templates
+from functools import lru_cache
 from typing import Annotated
 from app.config import settings
+from app.admission import admission_controller
+from app.revocation import revocation_list
+from app.events import item_events
+from app.loopmonitor import loop_monitor
 
 router = APIRouter(
     tags=["miscellaneous"],
 )
 
-templates = Jinja2Templates(directory="templates")
+@lru_cache
+def get_templates():
+    """Jinja2 environment, loaded on the first template render rather than at import."""
+    from fastapi.templating import Jinja2Templates
+
+    return Jinja2Templates(directory="templates")
+
 
 @router.get("/")
 async def read_root():
     return {"message": "Hello World", "version": "2.0"}
 
 
+@router.get("/health")
+async def health():
+    """Liveness probe. Bypasses admission control so it answers under load."""
+    return {"status": "ok"}
+
+
+@router.get("/metrics/admission")
+async def admission_metrics():
+    """Per route group concurrency limits, queue lengths and shed counts."""
+    return admission_controller.stats()
+
+
+@router.get("/metrics/revocation")
+async def revocation_metrics():
+    """Size of this worker's revoked-token Bloom filter and how often it hit the DB."""
+    return revocation_list.stats()
+
+
+@router.get("/metrics/events")
+async def event_metrics():
+    """SSE subscribers on this worker and events published or dropped."""
+    return item_events.stats()
+
+
+@router.get("/metrics/loop")
+async def loop_metrics():
+    """Event-loop lag percentiles and recent stalls with the route and stack that caused them."""
+    return loop_monitor.stats()
+
+
 @router.get("/info")
 async def get_info():
     """
@@ -25,7 +65,7 @@ async def get_info():
 
 @router.get("/welcome/{user_name}")
 async def welcome_user(request: Request, user_name: str):
-    return templates.TemplateResponse(
+    return get_templates().TemplateResponse(
         "index.html", 
         {"request": request, "name": user_name}
     )
@@ -1,16 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from typing import Annotated
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_read_db, get_write_db
 import app.models as models
-from app.schemas.user import Token, User, UserInDB
-from app.schemas.item import ItemResponse
+from app.schemas.user import Token, RefreshRequest, RevokeRequest, User, UserInDB
+from app.schemas.item import ItemResponse, ItemPublic
 import app.security as security
 from app.config import settings
-from app.dependencies import get_current_user, send_welcome_email
+from app.dependencies import get_current_user, get_token_payload, send_welcome_email
+from app.ratelimit import rate_limit
+from app.revocation import revocation_list
 
-from app.repositories import UserRepository
+from app.repositories import ItemRepository, UserRepository
 
 router = APIRouter(
     tags=["auth"],
@@ -21,10 +24,18 @@ user_router = APIRouter(
     tags=["users"],
 )
 
-@router.post("/token", response_model=Token)
+@router.post(
+    "/token",
+    response_model=Token,
+    # Throttle before bcrypt runs: per client IP and per targeted username
+    dependencies=[
+        Depends(rate_limit("token_ip")),
+        Depends(rate_limit("token_username", by="username")),
+    ],
+)
 async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    db: Annotated[Session, Depends(get_db)]
+    db: Annotated[Session, Depends(get_read_db)]
 ):
     """
     Endpoint to exchange username/password for a JWT access token.
@@ -38,17 +49,67 @@ async def login_for_access_token(
             detail="Incorrect username or password"
         )
     
-    if not security.verify_password(form_data.password, user.hashed_password):
+    # bcrypt takes a few hundred ms; keep it off the event loop
+    if not await run_in_threadpool(security.verify_password, form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=400,
             detail="Incorrect username or password"
         )
 
-    # Create the token
-    access_token = security.create_access_token(
-        data={"sub": user.username}
-    )
-    return {"access_token": access_token, "token_type": "bearer"}
+    return _issue_tokens(user.username)
+
+
+def _issue_tokens(username: str) -> dict:
+    return {
+        "access_token": security.create_access_token(data={"sub": username}),
+        "refresh_token": security.create_refresh_token(data={"sub": username}),
+        "token_type": "bearer",
+    }
+
+
+@router.post("/token/refresh", response_model=Token, dependencies=[Depends(rate_limit("token_ip"))])
+def refresh_access_token(body: RefreshRequest, db: Annotated[Session, Depends(get_write_db)]):
+    """
+    Exchange a refresh token for a new access/refresh pair, without a password.
+    Refresh tokens rotate: the one presented is revoked, so replaying it fails.
+    """
+    credentials_exception = HTTPException(status_code=401, detail="Invalid refresh token")
+    try:
+        payload = security.decode_token(body.refresh_token, token_type="refresh")
+    except security.jwt.JWTError:
+        raise credentials_exception
+    username, jti = payload.get("sub"), payload.get("jti")
+    if username is None or jti is None:
+        raise credentials_exception
+    if UserRepository(db).get_by_username(username) is None:
+        raise credentials_exception
+    if not revocation_list.revoke(db, jti, security.token_expiry(payload)):
+        raise credentials_exception  # already used or logged out
+    return _issue_tokens(username)
+
+
+@router.post("/token/revoke")
+def revoke_tokens(
+    payload: Annotated[dict, Depends(get_token_payload)],
+    db: Annotated[Session, Depends(get_write_db)],
+    body: RevokeRequest | None = None,
+):
+    """
+    Log out: revoke the access token used for this request and, if given,
+    the caller's refresh token. Takes effect in every worker within
+    `revocation_sync_seconds`.
+    """
+    if payload.get("jti") is not None:
+        revocation_list.revoke(db, payload["jti"], security.token_expiry(payload))
+    if body and body.refresh_token:
+        try:
+            refresh = security.decode_token(body.refresh_token, token_type="refresh")
+        except security.jwt.JWTError:
+            raise HTTPException(status_code=400, detail="Invalid refresh token")
+        if refresh.get("sub") != payload["sub"] or refresh.get("jti") is None:
+            raise HTTPException(status_code=400, detail="Invalid refresh token")
+        revocation_list.revoke(db, refresh["jti"], security.token_expiry(refresh))
+    return {"message": "Tokens revoked"}
 
 
 @user_router.get("/me", response_model=User)
@@ -59,6 +120,18 @@ async def read_users_me(current_user: Annotated[User, Depends(get_current_user)]
     return current_user
 
 
+@user_router.get("/me/items", response_model=list[ItemPublic])
+def read_my_items(
+    current_user: Annotated[models.UserDB, Depends(get_current_user)],
+    db: Annotated[Session, Depends(get_read_db)],
+):
+    """
+    Lists the items owned by the current authenticated user.
+    """
+    repo = ItemRepository(db)
+    return repo.list_rows_by_owner(current_user.id)
+
+
 @router.post("/signup/", response_model=ItemResponse)
 async def signup(email: str, background_tasks: BackgroundTasks):
     """
@@ -1,7 +1,21 @@
 """Pydantic schemas for API request/response validation."""
 
-from app.schemas.item import Item, ItemCreate, ItemUpdate, ItemPublic, ItemResponse
-from app.schemas.user import Token, TokenData, User, UserInDB
+from app.schemas.item import (
+    Item,
+    ItemCreate,
+    ItemUpdate,
+    ItemPublic,
+    ItemResponse,
+    ItemBatchRequest,
+    ItemBatchResponse,
+    QuoteLine,
+    QuoteRequest,
+    QuoteLineTotal,
+    QuoteResponse,
+    ItemChange,
+    ItemChangesResponse,
+)
+from app.schemas.user import Token, TokenData, RefreshRequest, RevokeRequest, User, UserInDB
 
 __all__ = [
     "Item",
@@ -9,8 +23,18 @@ __all__ = [
     "ItemUpdate",
     "ItemPublic",
     "ItemResponse",
+    "ItemBatchRequest",
+    "ItemBatchResponse",
+    "QuoteLine",
+    "QuoteRequest",
+    "QuoteLineTotal",
+    "QuoteResponse",
+    "ItemChange",
+    "ItemChangesResponse",
     "Token",
     "TokenData",
+    "RefreshRequest",
+    "RevokeRequest",
     "User",
     "UserInDB",
 ]
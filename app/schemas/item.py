@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from datetime import datetime
+from pydantic import BaseModel, Field
 
 class Item(BaseModel):
     """Pydantic model for item internal use."""
@@ -72,3 +73,84 @@ class ItemResponse(BaseModel):
     """Pydantic model for structured API responses with message."""
     message: str
     item: ItemPublic | None = None
+
+
+class ItemBatchRequest(BaseModel):
+    """Pydantic model for fetching many items by id in one request."""
+    ids: list[int] = Field(min_length=1, max_length=1000)
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "ids": [1, 2, 3]
+                }
+            ]
+        }
+    }
+
+
+class ItemBatchResponse(BaseModel):
+    """Pydantic model for batch lookups: found items in request order plus misses."""
+    items: list[ItemPublic]
+    missing: list[int] = []
+
+
+class QuoteLine(BaseModel):
+    """One cart line: an item and how many of it."""
+    item_id: int
+    quantity: int = Field(gt=0, le=1_000_000)
+
+
+class QuoteRequest(BaseModel):
+    """Pydantic model for pricing a cart of up to 100k lines."""
+    lines: list[QuoteLine] = Field(min_length=1, max_length=100_000)
+    include_lines: bool = True
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "lines": [
+                        {"item_id": 1, "quantity": 2},
+                        {"item_id": 3, "quantity": 1}
+                    ]
+                }
+            ]
+        }
+    }
+
+
+class QuoteLineTotal(BaseModel):
+    """Priced cart line; tax is the item's per-unit tax times quantity."""
+    item_id: int
+    quantity: int
+    unit_price: float
+    subtotal: float
+    tax: float
+    total: float
+
+
+class QuoteResponse(BaseModel):
+    """Pydantic model for a priced cart, amounts rounded to cents."""
+    subtotal: float
+    tax: float
+    total: float
+    line_count: int
+    lines: list[QuoteLineTotal] | None = None
+
+
+class ItemChange(BaseModel):
+    """One change log entry; `item` holds the public fields after the change."""
+    seq: int
+    action: str
+    id: int
+    item: ItemPublic | None = None
+    at: datetime
+
+
+class ItemChangesResponse(BaseModel):
+    """Pydantic model for delta sync: pass `next_since` as `since` on the next call."""
+    changes: list[ItemChange]
+    next_since: int
+    has_more: bool
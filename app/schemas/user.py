@@ -4,6 +4,17 @@ class Token(BaseModel):
     """Schema for returning a JWT token."""
     access_token: str
     token_type: str
+    refresh_token: str | None = None
+
+
+class RefreshRequest(BaseModel):
+    """Schema for exchanging a refresh token for a new token pair."""
+    refresh_token: str
+
+
+class RevokeRequest(BaseModel):
+    """Schema for logging out; the refresh token is revoked too if given."""
+    refresh_token: str | None = None
 
 
 class TokenData(BaseModel):
@@ -1,30 +1,64 @@
-from passlib.context import CryptContext
+import uuid
+from functools import lru_cache
 from jose import jwt
 from datetime import datetime, timedelta, timezone
 from .config import settings
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+@lru_cache
+def get_pwd_context():
+    """
+    Password hashing context, created on first use.
+    passlib and the bcrypt backend are only imported when a password is
+    actually hashed or verified, keeping them off the startup path.
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def get_password_hash(password: str) -> str:
     """Hashes a plain-text password."""
     # Bcrypt has a 72-byte limit. We truncate to ensure compatibility
     # and avoid ValueError from the bcrypt backend.
-    return pwd_context.hash(password[:72])
+    return get_pwd_context().hash(password[:72])
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifies that a plain-text password matches a hashed version."""
-    return pwd_context.verify(plain_password[:72], hashed_password)
+    return get_pwd_context().verify(plain_password[:72], hashed_password)
+
+def _encode_token(data: dict, token_type: str, expires_delta: timedelta) -> str:
+    to_encode = data.copy()
+    to_encode.update({
+        "exp": datetime.now(timezone.utc) + expires_delta,
+        # Unique id so a single token can be revoked before it expires
+        "jti": uuid.uuid4().hex,
+        "type": token_type,
+    })
+    return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     """Generates a JWT token with an optional expiration time."""
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(minutes=settings.access_token_expire_minutes)
-    
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
-    return encoded_jwt
+    if expires_delta is None:
+        expires_delta = timedelta(minutes=settings.access_token_expire_minutes)
+    return _encode_token(data, "access", expires_delta)
+
+def create_refresh_token(data: dict, expires_delta: timedelta | None = None) -> str:
+    """Generates a long-lived JWT that can only be exchanged for new tokens."""
+    if expires_delta is None:
+        expires_delta = timedelta(days=settings.refresh_token_expire_days)
+    return _encode_token(data, "refresh", expires_delta)
+
+def decode_token(token: str, token_type: str = "access") -> dict:
+    """
+    Decodes and verifies a JWT, raising `jwt.JWTError` if it is invalid,
+    expired or not of `token_type`. Tokens issued before token types
+    existed count as access tokens.
+    """
+    payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    if payload.get("type", "access") != token_type:
+        raise jwt.JWTError(f"Expected a {token_type} token")
+    return payload
 
+def token_expiry(payload: dict) -> datetime:
+    """Naive UTC expiry time of a decoded token."""
+    return datetime.fromtimestamp(payload["exp"], timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,239 @@
+"""
+Production server entry point: a pre-forking master running uvicorn workers.
+
+Usage: python -m app.serve [--host HOST] [--port PORT] [--workers N]
+
+The master imports the application once, binds the listening socket, and
+forks workers that all accept on that shared socket. It respawns workers
+that exit, including workers that retire themselves after
+`serve_max_requests` requests or once their RSS passes `serve_max_memory_mb`.
+
+Signals to the master:
+- SIGTERM / SIGINT: graceful shutdown of all workers.
+- SIGHUP: rolling restart, replacing workers one at a time.
+"""
+import argparse
+import logging
+import os
+import random
+import signal
+import socket
+import threading
+import time
+from pathlib import Path
+
+import uvicorn
+
+from app.config import settings
+
+logger = logging.getLogger("api_logger")
+
+
+# ==================== Worker Sizing ====================
+def cgroup_cpu_limit(root: Path = Path("/sys/fs/cgroup")) -> float | None:
+    """
+    CPU quota imposed by the container's cgroup, in cores, or None if unlimited.
+    Supports cgroup v2 (`cpu.max`) and v1 (`cpu.cfs_quota_us` / `cpu.cfs_period_us`).
+    """
+    try:
+        quota, period = (root / "cpu.max").read_text().split()
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+    try:
+        quota = int((root / "cpu" / "cpu.cfs_quota_us").read_text())
+        period = int((root / "cpu" / "cpu.cfs_period_us").read_text())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def default_worker_count() -> int:
+    """One worker per usable core: CPU affinity, capped by any cgroup quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    quota = cgroup_cpu_limit()
+    if quota is not None:
+        cpus = min(cpus, max(1, round(quota)))
+    return max(1, cpus)
+
+
+def _rss_bytes() -> int:
+    """Current resident set size of this process (Linux)."""
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+    except (OSError, ValueError, IndexError):
+        return 0
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+# ==================== Worker ====================
+def _run_worker(app, sock: socket.socket) -> None:
+    from app.database import dispose_engine_after_fork
+
+    # Never reuse pooled connections inherited from the master
+    dispose_engine_after_fork()
+    for sig in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT, signal.SIGCHLD):
+        signal.signal(sig, signal.SIG_DFL)
+
+    max_requests = settings.serve_max_requests
+    if max_requests:
+        # Jitter so workers started together don't all retire together
+        max_requests += random.randint(0, max(1, max_requests // 10))
+    config = uvicorn.Config(
+        app,
+        lifespan="on",
+        limit_max_requests=max_requests or None,
+        timeout_graceful_shutdown=settings.serve_graceful_timeout_seconds,
+        proxy_headers=True,
+    )
+    server = uvicorn.Server(config)
+
+    master_pid = os.getppid()
+    memory_limit = settings.serve_max_memory_mb * 1024 * 1024
+
+    def watchdog():
+        while not server.should_exit:
+            if os.getppid() != master_pid:
+                logger.warning(f"Worker {os.getpid()} lost its master, exiting")
+                server.should_exit = True
+            elif memory_limit and _rss_bytes() > memory_limit:
+                logger.warning(f"Worker {os.getpid()} over memory limit, retiring")
+                server.should_exit = True
+            time.sleep(1)
+
+    threading.Thread(target=watchdog, daemon=True).start()
+    server.run(sockets=[sock])
+
+
+# ==================== Master ====================
+class Master:
+    def __init__(self, app, sock: socket.socket, workers: int):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.children: set[int] = set()
+        self.stopping = False
+        self.rolling = False
+
+    def spawn(self) -> int:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                _run_worker(self.app, self.sock)
+            except BaseException:
+                logger.exception("Worker crashed")
+                code = 1
+            finally:
+                os._exit(code)
+        self.children.add(pid)
+        logger.info(f"Started worker {pid}")
+        return pid
+
+    def reap(self) -> list[int]:
+        exited = []
+        while self.children:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            self.children.discard(pid)
+            exited.append(pid)
+        return exited
+
+    def kill(self, pid: int, sig: int) -> None:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            # Already exited (e.g. retired itself) and waiting to be reaped
+            pass
+
+    def wait_for(self, pid: int, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while pid in self.children and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.1)
+        if pid in self.children:
+            self.kill(pid, signal.SIGKILL)
+
+    def rolling_restart(self) -> None:
+        """Start a replacement before stopping each old worker, one at a time."""
+        for old in list(self.children):
+            if old not in self.children:
+                continue  # exited meanwhile; the main loop replaces it
+            self.spawn()
+            self.kill(old, signal.SIGTERM)
+            self.wait_for(old, settings.serve_graceful_timeout_seconds + 5)
+        logger.info("Rolling restart complete")
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGHUP, self._roll)
+        for _ in range(self.workers):
+            self.spawn()
+
+        while not self.stopping:
+            if self.rolling:
+                self.rolling = False
+                self.rolling_restart()
+            for pid in self.reap():
+                logger.info(f"Worker {pid} exited")
+            while not self.stopping and len(self.children) < self.workers:
+                self.spawn()
+            time.sleep(0.5)
+
+        for pid in list(self.children):
+            self.kill(pid, signal.SIGTERM)
+        for pid in list(self.children):
+            self.wait_for(pid, settings.serve_graceful_timeout_seconds + 5)
+        logger.info("👋 All workers stopped")
+
+    def _stop(self, signum, frame) -> None:
+        self.stopping = True
+
+    def _roll(self, signum, frame) -> None:
+        self.rolling = True
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the API with pre-forked uvicorn workers.")
+    parser.add_argument("--host", default=settings.serve_host)
+    parser.add_argument("--port", type=int, default=settings.serve_port)
+    parser.add_argument("--workers", type=int, default=settings.serve_workers)
+    args = parser.parse_args(argv)
+
+    # Preload: import the app once in the master so workers share its pages
+    from app.main import app
+    from app.database import engine, ensure_schema
+
+    # Check the schema once here; workers racing to create it would collide
+    ensure_schema(engine)
+    engine.dispose()
+    workers = args.workers or default_worker_count()
+    sock = bind_socket(args.host, args.port)
+    logger.info(f"🚀 Serving on {args.host}:{args.port} with {workers} workers (master {os.getpid()})")
+    Master(app, sock, workers).run()
+
+
+if __name__ == "__main__":
+    main()
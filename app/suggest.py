@@ -0,0 +1,361 @@
+import bisect
+import sys
+import threading
+from array import array
+from collections import Counter
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.change import ChangeLogDB, ChangeLogHeadDB
+from app.models.item import ItemDB
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def _trigrams(key: str) -> set[str]:
+    # Pad the start so the first characters carry more weight, which suits
+    # prefix matching better than symmetric padding.
+    padded = f"  {key}"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _build_postings(entries) -> dict[str, array]:
+    lists: dict[str, list[int]] = {}
+    for key, id in entries:
+        for gram in _trigrams(key):
+            lists.setdefault(gram, []).append(id)
+    return {gram: array("q", ids) for gram, ids in lists.items()}
+
+
+def _postings_size(postings: dict[str, array]) -> int:
+    return sys.getsizeof(postings) + sum(
+        sys.getsizeof(gram) + sys.getsizeof(posting) for gram, posting in postings.items()
+    )
+
+
+def _add_to_postings(postings: dict[str, array], id: int, key: str) -> int:
+    """Append `id` under each trigram of `key`; returns the bytes added."""
+    added = 0
+    for gram in _trigrams(key):
+        posting = postings.get(gram)
+        if posting is None:
+            posting = postings[gram] = array("q")
+            added += sys.getsizeof(gram) + sys.getsizeof(posting)
+        posting.append(id)
+        added += posting.itemsize
+    return added
+
+
+class NameIndex:
+    """
+    In-process autocomplete index over item names.
+
+    Normalized names are kept sorted in chunks of at most `chunk_size`
+    entries, with each chunk's last key in `_maxes`. Exact prefix lookups
+    bisect `_maxes` and then one chunk, so a query costs O(log n + k), and an
+    insert or delete only shifts entries within its chunk instead of the
+    whole index.
+
+    Typo-tolerant lookups use trigram postings stored as compact int arrays.
+    They take several times longer to build than the sorted names, so they
+    are built in a background thread after each load; until then fuzzy
+    queries return only prefix matches. Postings are append-only; entries
+    left behind by renames and deletes are filtered on read, and once too
+    many pile up the postings are rebuilt in the background.
+
+    Byte counts for `memory_usage` are kept as running totals, so reporting
+    them doesn't walk the index.
+
+    Each worker process has its own index. Its own writes show up at once;
+    `sync` replays the change log to pick up the other workers' writes.
+    """
+
+    # Trigrams this common don't discriminate between candidates; skip them
+    max_posting_scan = 50_000
+    # Chunks are split once they grow past twice this size
+    chunk_size = 1_000
+
+    def __init__(self):
+        self._keys: list[list[str]] = []
+        self._ids: list[array] = []
+        self._maxes: list[str] = []
+        self._names: dict[int, str] = {}
+        self._postings: dict[str, array] | None = None
+        self._key_bytes = 0
+        self._name_bytes = 0
+        self._postings_bytes = 0
+        self._stale_postings = 0
+        self._rebuild_log: list[tuple[int, str]] | None = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self.synced_seq = 0
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def postings_ready(self) -> bool:
+        return self._postings is not None
+
+    # ==================== Building & Updates ====================
+    def build(self, db: Session) -> None:
+        """Rebuild the index from the items table."""
+        # Read the change log position first: changes after it are replayed
+        # by `sync`, which is harmless if the build already saw them
+        seq = db.execute(select(ChangeLogHeadDB.seq).where(ChangeLogHeadDB.id == 1)).scalar_one()
+        stmt = select(ItemDB.id, ItemDB.name).where(ItemDB.name.is_not(None))
+        rows = db.execute(stmt.execution_options(yield_per=10_000))
+        self.load((id, name) for id, name in rows)
+        self.synced_seq = seq
+
+    def try_build(self, db: Session) -> bool:
+        """
+        Build the index on first use unless another thread already is.
+        Returns whether the index is ready; False means a build is running.
+        """
+        if not self._build_lock.acquire(blocking=False):
+            return False
+        try:
+            if not self.ready:
+                self.build(db)
+        finally:
+            self._build_lock.release()
+        return True
+
+    def sync(self, db: Session, batch: int = 10_000) -> int:
+        """
+        Apply item changes logged since the last build or sync, including
+        those written by other workers. Falls back to a full rebuild if
+        compaction has removed entries not yet applied.
+        Returns the number of changes applied.
+        """
+        stmt = (
+            select(ChangeLogDB.seq, ChangeLogDB.entity_id, ChangeLogDB.action, ChangeLogDB.data)
+            .where(ChangeLogDB.seq > self.synced_seq, ChangeLogDB.entity == "item")
+            .order_by(ChangeLogDB.seq)
+            .limit(batch)
+        )
+        rows = db.execute(stmt).all()
+        compacted = db.execute(
+            select(ChangeLogHeadDB.compacted_seq).where(ChangeLogHeadDB.id == 1)
+        ).scalar_one()
+        if compacted > self.synced_seq:
+            self.build(db)
+            return len(self)
+        for seq, id, action, data in rows:
+            if action == "deleted":
+                self.remove(id)
+            else:
+                self.add(id, (data or {}).get("name"))
+            self.synced_seq = seq
+        return len(rows)
+
+    def load(self, pairs, background: bool = True) -> None:
+        """
+        Replace the index contents with `(id, name)` pairs. Trigram postings
+        follow in a background thread unless `background` is False.
+        """
+        names = {id: name for id, name in pairs}
+        entries = sorted((_normalize(name), id) for id, name in names.items())
+        chunks = [entries[i:i + self.chunk_size] for i in range(0, len(entries), self.chunk_size)]
+        key_bytes = sum(sys.getsizeof(key) for key, _ in entries)
+        name_bytes = sum(sys.getsizeof(name) for name in names.values())
+        postings = None if background else _build_postings(entries)
+        postings_bytes = _postings_size(postings) if postings is not None else 0
+        with self._lock:
+            self._keys = [[key for key, _ in chunk] for chunk in chunks]
+            self._ids = [array("q", (id for _, id in chunk)) for chunk in chunks]
+            self._maxes = [keys[-1] for keys in self._keys]
+            self._names = names
+            self._key_bytes, self._name_bytes = key_bytes, name_bytes
+            self._postings, self._postings_bytes = postings, postings_bytes
+            self._stale_postings = 0
+            self._rebuild_log = None
+            self._generation += 1
+            self.ready = True
+            if background:
+                self._rebuild_postings_later_locked()
+
+    def add(self, id: int, name: str | None) -> None:
+        """Insert or rename an item."""
+        with self._lock:
+            self._remove_locked(id)
+            if name is None:
+                return
+            key = _normalize(name)
+            self._names[id] = name
+            self._key_bytes += sys.getsizeof(key)
+            self._name_bytes += sys.getsizeof(name)
+            self._insert_locked(key, id)
+            if self._postings is not None:
+                self._postings_bytes += _add_to_postings(self._postings, id, key)
+            if self._rebuild_log is not None:
+                self._rebuild_log.append((id, key))
+
+    def remove(self, id: int) -> None:
+        with self._lock:
+            self._remove_locked(id)
+
+    def _remove_locked(self, id: int) -> None:
+        name = self._names.pop(id, None)
+        if name is None:
+            return
+        key = _normalize(name)
+        self._delete_locked(key, id)
+        self._key_bytes -= sys.getsizeof(key)
+        self._name_bytes -= sys.getsizeof(name)
+        if self._postings is not None:
+            self._stale_postings += len(_trigrams(key))
+            if self._stale_postings > max(len(self._names), 1_000) and self._rebuild_log is None:
+                self._rebuild_postings_later_locked()
+
+    def _insert_locked(self, key: str, id: int) -> None:
+        if not self._keys:
+            self._keys, self._ids, self._maxes = [[key]], [array("q", [id])], [key]
+            return
+        chunk = min(bisect.bisect_left(self._maxes, key), len(self._maxes) - 1)
+        keys, ids = self._keys[chunk], self._ids[chunk]
+        pos = bisect.bisect_left(keys, key)
+        keys.insert(pos, key)
+        ids.insert(pos, id)
+        self._maxes[chunk] = keys[-1]
+        if len(keys) > 2 * self.chunk_size:
+            half = len(keys) // 2
+            self._keys[chunk:chunk + 1] = [keys[:half], keys[half:]]
+            self._ids[chunk:chunk + 1] = [ids[:half], ids[half:]]
+            self._maxes[chunk:chunk + 1] = [keys[half - 1], keys[-1]]
+
+    def _delete_locked(self, key: str, id: int) -> None:
+        chunk = bisect.bisect_left(self._maxes, key)
+        # Items sharing a name may span several chunks
+        while chunk < len(self._keys):
+            keys, ids = self._keys[chunk], self._ids[chunk]
+            pos = bisect.bisect_left(keys, key)
+            while pos < len(keys) and keys[pos] == key:
+                if ids[pos] == id:
+                    del keys[pos]
+                    del ids[pos]
+                    if keys:
+                        self._maxes[chunk] = keys[-1]
+                    else:
+                        del self._keys[chunk], self._ids[chunk], self._maxes[chunk]
+                    return
+                pos += 1
+            chunk += 1
+
+    def _rebuild_postings_later_locked(self) -> None:
+        # Additions made while the thread builds are logged and replayed
+        self._rebuild_log = []
+        threading.Thread(
+            target=self._rebuild_postings, args=(self._generation,),
+            name="suggest-postings", daemon=True,
+        ).start()
+
+    def _rebuild_postings(self, generation: int) -> None:
+        with self._lock:
+            names = list(self._names.items())
+        postings = _build_postings((_normalize(name), id) for id, name in names)
+        postings_bytes = _postings_size(postings)
+        with self._lock:
+            if generation != self._generation or self._rebuild_log is None:
+                return  # the whole index was reloaded meanwhile
+            for id, key in self._rebuild_log:
+                postings_bytes += _add_to_postings(postings, id, key)
+            self._postings, self._postings_bytes = postings, postings_bytes
+            self._stale_postings = 0
+            self._rebuild_log = None
+
+    # ==================== Queries ====================
+    def suggest(self, prefix: str, limit: int = 10, fuzzy: bool = False) -> list[str]:
+        """
+        Return up to `limit` distinct item names starting with `prefix`.
+        With `fuzzy`, fill remaining slots with names sharing most of the
+        prefix's trigrams, which tolerates small typos.
+        """
+        key = _normalize(prefix)
+        results: list[str] = []
+        seen: set[str] = set()
+        with self._lock:
+            for _, id in self._prefix_entries_locked(key):
+                if len(results) == limit:
+                    break
+                name = self._names[id]
+                if name not in seen:
+                    seen.add(name)
+                    results.append(name)
+            if fuzzy and len(results) < limit and len(key) >= 3:
+                for name in self._fuzzy_locked(key, limit * 4):
+                    if name not in seen:
+                        seen.add(name)
+                        results.append(name)
+                        if len(results) == limit:
+                            break
+        return results
+
+    def _prefix_entries_locked(self, key: str):
+        """(key, id) entries starting with `key`, in key order."""
+        chunk = bisect.bisect_left(self._maxes, key)
+        pos = bisect.bisect_left(self._keys[chunk], key) if chunk < len(self._keys) else 0
+        while chunk < len(self._keys):
+            keys, ids = self._keys[chunk], self._ids[chunk]
+            while pos < len(keys):
+                if not keys[pos].startswith(key):
+                    return
+                yield keys[pos], ids[pos]
+                pos += 1
+            chunk, pos = chunk + 1, 0
+
+    def _fuzzy_locked(self, key: str, candidates: int) -> list[str]:
+        postings = self._postings or {}
+        grams = _trigrams(key)
+        hits: Counter[int] = Counter()
+        for gram in grams:
+            posting = postings.get(gram)
+            if posting is not None and len(posting) <= self.max_posting_scan:
+                hits.update(posting)
+        scored = []
+        for id, _ in hits.most_common(candidates):
+            name = self._names.get(id)
+            if name is None:
+                continue
+            # Re-score against the current name: postings may be stale
+            target = _normalize(name)[:len(key) + 1]
+            score = len(grams & _trigrams(target)) / len(grams)
+            if score >= 0.5:
+                scored.append((-score, len(name), name))
+        return [name for _, _, name in sorted(scored)]
+
+    def memory_usage(self) -> dict:
+        """
+        Approximate bytes held by the index, by component. O(1): string and
+        postings sizes are running totals, containers are estimated from
+        their entry counts.
+        """
+        with self._lock:
+            entries, chunks = len(self._names), len(self._keys)
+            pointer = array("q").itemsize
+            keys = self._key_bytes + sys.getsizeof(self._keys) + sys.getsizeof(self._maxes) + (
+                chunks * sys.getsizeof([]) + entries * pointer
+            )
+            ids = sys.getsizeof(self._ids) + chunks * sys.getsizeof(array("q")) + entries * pointer
+            names = sys.getsizeof(self._names) + self._name_bytes
+            postings = self._postings_bytes
+            return {
+                "names": entries,
+                "trigrams": len(self._postings or ()),
+                "keys_bytes": keys,
+                "ids_bytes": ids,
+                "names_bytes": names,
+                "postings_bytes": postings,
+                "total_bytes": keys + ids + names + postings,
+            }
+
+
+# Built in the app lifespan, kept current by ItemRepository writes and
+# synced with other workers' writes from the change log
+item_name_index = NameIndex()
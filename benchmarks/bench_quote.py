@@ -0,0 +1,113 @@
+"""
+Compare the vectorized quote computation with a pure-Python Decimal loop,
+then break down where the time goes in a whole POST /items/quote request.
+
+For 100k lines the NumPy pass is a few percent of the request: parsing and
+validating the body and rendering per-line JSON take most of it (roughly
+1/3 and 1/2 here). With `include_lines=false` rendering drops out.
+
+Run with: python -m benchmarks.bench_quote [lines]
+"""
+import json
+import random
+import sys
+import time
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import ItemDB
+from app.quote import compute_quote
+from app.repositories import ItemRepository
+from app.schemas.item import QuoteRequest
+
+CENT = Decimal("0.01")
+
+
+def python_quote(item_ids, quantities, catalog_rows):
+    """Reference implementation: one Decimal computation per line."""
+    prices = {
+        int(id): (
+            Decimal(repr(price)).quantize(CENT, ROUND_HALF_UP),
+            Decimal(repr(tax)).quantize(CENT, ROUND_HALF_UP),
+        )
+        for id, price, tax in catalog_rows
+    }
+    subtotal = tax_total = Decimal(0)
+    lines = []
+    for id, qty in zip(item_ids, quantities):
+        price, tax = prices[id]
+        line_subtotal, line_tax = price * qty, tax * qty
+        subtotal += line_subtotal
+        tax_total += line_tax
+        lines.append((line_subtotal, line_tax))
+    return subtotal, tax_total, lines
+
+
+def timed(fn, repeat: int = 5) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def request_breakdown(item_ids, quantities, catalog_rows):
+    """Time each stage of the /items/quote route for one cart."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.bulk_insert_mappings(
+            ItemDB, [{"id": id, "name": f"Item {id}", "price": price, "tax": tax} for id, price, tax in catalog_rows]
+        )
+        db.commit()
+    body = json.dumps({"lines": [{"item_id": i, "quantity": q} for i, q in zip(item_ids, quantities)]})
+
+    with Session() as db:
+        stages = {}
+        stages["validate"], cart = timed(lambda: QuoteRequest.model_validate_json(body))
+        stages["unpack"], (ids, qty) = timed(
+            lambda: ([line.item_id for line in cart.lines], [line.quantity for line in cart.lines])
+        )
+        stages["load"], rows = timed(lambda: ItemRepository(db).get_price_rows(ids))
+        stages["compute"], quote = timed(lambda: compute_quote(ids, qty, rows))
+        stages["as_dict"], content = timed(lambda: quote.as_dict(include_lines=True))
+        stages["render"], _ = timed(lambda: JSONResponse(content=content))
+    total = sum(stages.values())
+    print(f"request   {total * 1000:8.1f}ms for one {len(body) / 1e6:.1f}MB request, by stage:")
+    for stage, seconds in stages.items():
+        print(f"  {stage:<8}{seconds * 1000:8.1f}ms  {seconds / total:4.0%}")
+
+
+def main(count: int = 100_000, items: int = 5_000):
+    rng = random.Random(42)
+    catalog_rows = [
+        (id, round(rng.uniform(0.5, 500), rng.choice([2, 3])), rng.choice([0.0, 0.05, 1.6, 8.0]))
+        for id in range(1, items + 1)
+    ]
+    catalog = np.array(catalog_rows)
+    item_ids = [rng.randint(1, items) for _ in range(count)]
+    quantities = [rng.randint(1, 20) for _ in range(count)]
+
+    py_time, (subtotal, tax, _) = timed(lambda: python_quote(item_ids, quantities, catalog_rows))
+    np_time, quote = timed(lambda: compute_quote(item_ids, quantities, catalog))
+    json_time, _ = timed(lambda: quote.as_dict(include_lines=True))
+
+    assert int(quote.subtotal.sum()) == int(subtotal * 100)
+    assert int(quote.tax.sum()) == int(tax * 100)
+    print(f"python    {py_time * 1000:8.1f}ms for {count} lines")
+    print(f"numpy     {np_time * 1000:8.1f}ms ({py_time / np_time:.0f}x faster)")
+    print(f"as_dict   {json_time * 1000:8.1f}ms to build per-line output")
+    print(f"totals    subtotal={subtotal} tax={tax} (identical)")
+    request_breakdown(item_ids, quantities, catalog_rows)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
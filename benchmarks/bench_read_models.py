@@ -0,0 +1,79 @@
+"""
+Compare full ORM hydration against column-only row reads for list endpoints.
+
+Run with: python -m benchmarks.bench_read_models [rows]
+"""
+import sys
+import time
+import tracemalloc
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import ItemDB
+from app.repositories import ItemRepository
+from app.schemas.item import ItemPublic
+
+
+def _seed(session, rows: int):
+    session.bulk_insert_mappings(
+        ItemDB,
+        [
+            {"name": f"Item {i}", "price": i * 0.5, "description": f"Description {i}", "tax": 0.2}
+            for i in range(rows)
+        ],
+    )
+    session.commit()
+
+
+def _project(fetch):
+    return [ItemPublic.model_validate(obj, from_attributes=True) for obj in fetch()]
+
+
+def _measure(label: str, fetch, rows: int):
+    # Time without tracing first; tracemalloc slows allocation-heavy code a lot.
+    start = time.perf_counter()
+    result = _project(fetch)
+    elapsed = time.perf_counter() - start
+    assert len(result) == rows
+    del result
+
+    tracemalloc.start()
+    _project(fetch)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:<12} time={elapsed * 1000:8.2f}ms "
+        f"peak={peak / 1024:9.1f}KiB per_row={peak / rows:7.1f}B"
+    )
+
+
+def main(rows: int = 10_000):
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+
+    with Session() as session:
+        _seed(session, rows)
+
+    def orm():
+        # A fresh session per pass so the identity map starts empty each time.
+        with Session() as session:
+            return ItemRepository(session).search()
+
+    def row_tuples():
+        with Session() as session:
+            return ItemRepository(session).search_rows()
+
+    _measure("orm", orm, rows)
+    _measure("rows", row_tuples, rows)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,46 @@
+"""
+Measure import time and time to first request of a fresh process.
+
+Run with: python -m benchmarks.bench_startup [runs]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter() - start
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    client.get("/health")
+print(json.dumps({"import": imported, "first_request": time.perf_counter() - start}))
+"""
+
+
+def main(runs: int = 5):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp}/bench.db")
+        samples = []
+        for _ in range(runs):
+            out = subprocess.run(
+                [sys.executable, "-W", "ignore", "-c", PROBE],
+                env=env, capture_output=True, text=True, check=True,
+            ).stdout
+            samples.append(json.loads(out.strip().splitlines()[-1]))
+
+    # The first run creates the schema; later runs hit the fingerprint check
+    for key in ("import", "first_request"):
+        values = [s[key] * 1000 for s in samples]
+        print(
+            f"{key:<14} median={statistics.median(values):8.1f}ms "
+            f"min={min(values):8.1f}ms max={max(values):8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,63 @@
+"""
+Measure build time, query latency and memory of the autocomplete index.
+
+Run with: python -m benchmarks.bench_suggest [names]
+"""
+import random
+import sys
+import time
+
+from app.suggest import NameIndex
+
+WORDS = [
+    "wireless", "mouse", "mechanical", "keyboard", "monitor", "usb", "hub",
+    "laptop", "stand", "webcam", "speaker", "cable", "charger", "dock", "lamp",
+    "desk", "chair", "headset", "adapter", "router", "drive", "case", "pad",
+]
+
+
+def main(count: int = 1_000_000):
+    rng = random.Random(42)
+    names = [
+        f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {i}" for i in range(count)
+    ]
+
+    index = NameIndex()
+    start = time.perf_counter()
+    index.load(enumerate(names))
+    print(f"build     {time.perf_counter() - start:8.2f}s for {count} names (prefix queries ready)")
+
+    usage = index.memory_usage()
+    print(f"memory    {usage['total_bytes'] / 2**20:8.1f}MiB without trigram postings")
+
+    start = time.perf_counter()
+    while not index.postings_ready:
+        time.sleep(0.01)
+    print(f"postings  {time.perf_counter() - start:8.2f}s more in the background thread")
+
+    for label, prefix, fuzzy in [
+        ("prefix", "wireless mo", False),
+        ("prefix", "lap", False),
+        ("fuzzy", "wirelss mouse 12", True),
+    ]:
+        runs = 1_000 if not fuzzy else 20
+        start = time.perf_counter()
+        for _ in range(runs):
+            result = index.suggest(prefix, limit=10, fuzzy=fuzzy)
+        per_query = (time.perf_counter() - start) / runs
+        print(f"{label:<9} {per_query * 1e6:8.1f}us  {prefix!r} -> {len(result)} results")
+
+    start = time.perf_counter()
+    for i in range(1_000):
+        index.add(count + i, f"New item {i}")
+    print(f"insert    {(time.perf_counter() - start) * 1e3:8.1f}us per item")
+
+    start = time.perf_counter()
+    usage = index.memory_usage()
+    stats_us = (time.perf_counter() - start) * 1e6
+    print(f"memory    {usage['total_bytes'] / 2**20:8.1f}MiB with {usage['trigrams']} trigrams")
+    print(f"stats     {stats_us:8.1f}us per memory_usage call")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
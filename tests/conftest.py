@@ -5,10 +5,32 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.database import Base, get_db
+from app.database import Base, get_db, get_read_db, get_write_db
 from app.main import app
 from app import models
 from app import security
+from app.cache import item_search_cache
+from app.suggest import item_name_index
+from app.ratelimit import rate_limiter
+from app.revocation import revocation_list
+from app.loopmonitor import loop_monitor
+
+# Fail any test during which a route blocks the event loop
+loop_monitor.strict = True
+
+
+@pytest.fixture(autouse=True)
+def no_blocked_event_loop():
+    loop_monitor.take_violations()
+    yield
+    violations = loop_monitor.take_violations()
+    if violations:
+        details = "\n".join(
+            f"{v.route} blocked the loop for {v.duration * 1000:.0f}ms in {v.function}:\n"
+            + "".join(v.stack[-6:])
+            for v in violations
+        )
+        pytest.fail(f"Event loop blocked by async code:\n{details}")
 
 # 1. Setup a separate Test Database
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -29,6 +51,8 @@ def setup_db():
     yield
     # Drop tables after tests are done
     Base.metadata.drop_all(bind=engine)
+    # Release pooled connections so the next module reopens a fresh file
+    engine.dispose()
     # Optionally remove the file
     if os.path.exists("./test.db"):
         os.remove("./test.db")
@@ -56,15 +80,25 @@ def client(db_session):
             pass 
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_write_db] = override_get_db
+    item_search_cache.clear()
+    rate_limiter.reset()
     with TestClient(app) as c:
+        # The lifespan indexes the production DB; point it at the test DB
+        item_name_index.build(db_session)
+        revocation_list.rebuild(db_session)
         yield c
     app.dependency_overrides.clear()
 
 @pytest.fixture(scope="function")
 def test_user(db_session):
     """
-    Creates a 'johndoe' user in the test database.
+    Creates a 'johndoe' user in the test database (reused within a module).
     """
+    user = db_session.query(models.UserDB).filter_by(username="johndoe").first()
+    if user is not None:
+        return user
     user = models.UserDB(
         username="johndoe",
         email="johndoe@example.com",
@@ -75,3 +109,11 @@ def test_user(db_session):
     db_session.commit()
     db_session.refresh(user)
     return user
+
+@pytest.fixture(scope="function")
+def auth_headers(test_user):
+    """
+    Authorization headers carrying a valid token for 'johndoe'.
+    """
+    token = security.create_access_token(data={"sub": test_user.username})
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from app.admission import AdaptiveLimiter, AdmissionController, Shed
+
+
+def make_limiter(**overrides):
+    options = dict(
+        initial_limit=1, min_limit=1, max_limit=4, max_queue=1,
+        queue_timeout=0.05, target_latency=0.1,
+    )
+    options.update(overrides)
+    return AdaptiveLimiter("test", **options)
+
+
+def test_limiter_queues_then_sheds():
+    async def main():
+        limiter = make_limiter()
+        await limiter.acquire()  # takes the only slot
+        queued = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(Shed, match="queue full"):
+            await limiter.acquire()
+
+        limiter.release(latency=None)  # hands the slot to the queued request
+        await queued
+        assert limiter.inflight == 1
+
+        with pytest.raises(Shed, match="queue timeout"):
+            await limiter.acquire()
+        return limiter.stats()
+
+    stats = asyncio.run(main())
+    assert stats["queued"] == 2
+    assert stats["shed"] == 2
+    assert stats["timed_out"] == 1
+
+
+def test_cancel_after_grant_returns_the_slot():
+    async def main():
+        limiter = make_limiter(queue_timeout=1)
+        await limiter.acquire()
+        queued = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        limiter.release(latency=None)  # grants the slot to the queued request
+        queued.cancel()  # ...which is cancelled before it resumes
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        assert limiter.inflight == 0
+        await asyncio.wait_for(limiter.acquire(), 0.5)
+
+    asyncio.run(main())
+
+
+def test_groups_use_their_own_target_latency(monkeypatch):
+    monkeypatch.setattr("app.admission.settings.admission_group_target_latency_ms", {"auth": 1000.0})
+    controller = AdmissionController({"auth": "/token", "items": "/items"}, [])
+    assert controller.limiter_for("/token").target_latency == 1.0
+    assert controller.limiter_for("/items/").target_latency == 0.25
+
+
+def test_limit_adapts_to_latency():
+    limiter = make_limiter(initial_limit=2)
+    for _ in range(10):
+        limiter.inflight += 1
+        limiter.release(latency=0.01)
+    assert limiter.limit > 2
+
+    grown = limiter.limit
+    limiter.inflight += 1
+    limiter.release(latency=1.0)
+    assert limiter.limit == pytest.approx(grown * limiter.backoff)
+
+
+def test_priority_paths_bypass_and_groups_resolve():
+    controller = AdmissionController({"items": "/items"}, ["/health"])
+    assert controller.limiter_for("/health") is None
+    assert controller.limiter_for("/items/5").name == "items"
+    assert controller.limiter_for("/info").name == "default"
+
+
+def test_health_and_metrics_routes(client):
+    assert client.get("/health").json() == {"status": "ok"}
+    client.get("/items/")
+    stats = client.get("/metrics/admission").json()
+    assert stats["items"]["admitted"] >= 1
+    assert "shed" in stats["items"]
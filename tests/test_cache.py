@@ -0,0 +1,79 @@
+import asyncio
+
+from app.cache import MicroCache, SingleFlight
+from app.deadlines import current_deadline
+from app.repositories import ItemRepository
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    calls = 0
+
+    async def slow_search():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ["result"]
+
+    async def main():
+        flight = SingleFlight()
+        return await asyncio.gather(*(flight.do("q", slow_search) for _ in range(20)))
+
+    results = asyncio.run(main())
+    assert calls == 1
+    assert results == [["result"]] * 20
+
+
+def test_micro_cache_drops_results_loaded_across_a_write():
+    cache = MicroCache(ttl_seconds=60, max_entries=10)
+
+    async def load_then_write():
+        cache.invalidate()  # a write lands while the load is in flight
+        return "stale"
+
+    async def main():
+        assert await cache.get_or_load("k", load_then_write) == "stale"
+        assert await cache.get_or_load("k", lambda: asyncio.sleep(0, "fresh")) == "fresh"
+        assert await cache.get_or_load("k", lambda: asyncio.sleep(0, "later")) == "fresh"
+
+    asyncio.run(main())
+
+
+def test_micro_cache_sees_other_workers_writes_through_the_head(monkeypatch):
+    clock, head = [1000.0], [7]
+    monkeypatch.setattr("app.cache.time.monotonic", lambda: clock[0])
+    cache = MicroCache(ttl_seconds=2, max_entries=10, head=lambda: head[0])
+    load = lambda value: lambda: asyncio.sleep(0, value)
+
+    async def main():
+        assert await cache.get_or_load("k", load("old")) == "old"
+        head[0] += 1  # another worker wrote
+        clock[0] += 1
+        assert await cache.get_or_load("k", load("new")) == "old"  # head checked once per TTL
+        clock[0] += 1
+        cache._entries["k"] = (clock[0] + 60, "old")  # as if loaded just before the write
+        assert await cache.get_or_load("k", load("new")) == "new"
+
+    asyncio.run(main())
+
+
+def test_item_write_invalidates_search_results(client, auth_headers):
+    assert client.get("/items/", params={"q": "Cached"}).json() == []
+
+    client.post("/items/", json={"name": "Cached Vase", "price": 5.0}, headers=auth_headers)
+    names = [item["name"] for item in client.get("/items/", params={"q": "Cached"}).json()]
+    assert names == ["Cached Vase"]
+
+
+def test_search_load_runs_on_its_own_session_without_deadline(client, db_session, monkeypatch):
+    seen = {}
+    search_rows = ItemRepository.search_rows
+
+    def spy(self, *args, **kwargs):
+        seen.update(db=self.db, deadline=current_deadline.get())
+        return search_rows(self, *args, **kwargs)
+
+    monkeypatch.setattr(ItemRepository, "search_rows", spy)
+    assert client.get("/items/", params={"q": "Detached"}).status_code == 200
+    # Another request's deadline or closed session can't break a shared load
+    assert seen["db"] is not db_session
+    assert seen["deadline"] is None
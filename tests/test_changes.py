@@ -0,0 +1,103 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from sqlalchemy import event, select
+
+from app.models import ChangeLogDB
+from app.repositories import ChangeLogRepository, ItemRepository
+
+
+def test_changes_since_checkpoint(client, db_session):
+    head = ChangeLogRepository(db_session).head().seq
+    repo = ItemRepository(db_session)
+    item = repo.create({"name": "Delta Desk", "price": 100.0})
+    repo.update(item, {"price": 90.0})
+    item_id = item.id
+    repo.delete(item_id)
+
+    response = client.get("/items/changes", params={"since": head, "limit": 2})
+    assert response.status_code == 200
+    page = response.json()
+    assert [(c["action"], c["id"]) for c in page["changes"]] == [
+        ("created", item_id), ("updated", item_id),
+    ]
+    assert page["changes"][1]["item"] == {"name": "Delta Desk", "price": 90.0, "description": None}
+    assert page["has_more"] is True
+
+    response = client.get("/items/changes", params={"since": page["next_since"]})
+    page = response.json()
+    assert [(c["action"], c["item"]) for c in page["changes"]] == [("deleted", None)]
+    assert page["has_more"] is False
+    assert page["next_since"] == head + 3
+
+    assert client.get("/items/changes", params={"since": head + 3}).json()["changes"] == []
+
+
+def test_sequence_has_no_gaps_under_concurrent_writes(db_session):
+    start = ChangeLogRepository(db_session).head().seq
+    session_factory = lambda: type(db_session)(bind=db_session.get_bind())
+
+    def write(i):
+        with session_factory() as db:
+            ItemRepository(db).create({"name": f"Concurrent {i}", "price": 1.0})
+
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(write, range(8)))
+
+    seqs = db_session.execute(
+        select(ChangeLogDB.seq).where(ChangeLogDB.seq > start).order_by(ChangeLogDB.seq)
+    ).scalars().all()
+    assert seqs == list(range(start + 1, start + 9))
+
+
+def test_compaction_bounds_the_log_and_forces_resync(client, db_session):
+    repo = ItemRepository(db_session)
+    for i in range(5):
+        repo.create({"name": f"Compacted {i}", "price": 1.0})
+    changes = ChangeLogRepository(db_session)
+    head = changes.head().seq
+
+    assert changes.compact(max_entries=2, retention=timedelta(days=1)) > 0
+    assert db_session.query(ChangeLogDB).count() == 2
+
+    response = client.get("/items/changes", params={"since": head - 3})
+    assert response.status_code == 410
+    response = client.get("/items/changes", params={"since": head - 2})
+    assert len(response.json()["changes"]) == 2
+
+
+def test_compaction_while_reading_forces_resync(client, db_session, monkeypatch):
+    repo = ItemRepository(db_session)
+    for i in range(3):
+        repo.create({"name": f"Racing {i}", "price": 1.0})
+    head = ChangeLogRepository(db_session).head().seq
+    since = ChangeLogRepository.since
+
+    def since_then_compact(self, *args):
+        entries = since(self, *args)
+        ChangeLogRepository(db_session).compact(max_entries=0, retention=timedelta(days=1))
+        return entries
+
+    monkeypatch.setattr(ChangeLogRepository, "since", since_then_compact)
+    response = client.get("/items/changes", params={"since": head - 2})
+    assert response.status_code == 410
+
+
+def test_writes_lock_the_change_log_head_last(db_session, test_user):
+    statements = []
+    engine = db_session.get_bind()
+    record = lambda conn, cursor, statement, *args: statements.append(statement.split()[:2])
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        repo = ItemRepository(db_session)
+        item = repo.create_owned({"name": "Ordered Lamp", "price": 3.0}, test_user.id, quota=100)
+        repo.delete(item.id)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    writes = [s for s in statements if s[0] in ("INSERT", "UPDATE", "DELETE")]
+    # users and items rows first, the change_log_head row last, in both writes
+    assert writes == [
+        ["UPDATE", "users"], ["INSERT", "INTO"], ["UPDATE", "change_log_head"], ["INSERT", "INTO"],
+        ["UPDATE", "users"], ["DELETE", "FROM"], ["UPDATE", "change_log_head"], ["INSERT", "INTO"],
+    ]
@@ -9,10 +9,11 @@ from app.database import Base, get_db
 from app.main import app
 from app.models import ItemDB
 
-def test_db_isolation(client):
+def test_db_isolation(client, auth_headers):
     # 1. Create an item via the API (using the test database)
     response = client.post(
         "/items/",
+        headers=auth_headers,
         json={
             "name": "Test Item",
             "price": 9.99,
@@ -0,0 +1,150 @@
+import asyncio
+import sqlite3
+import time
+
+import pytest
+from fastapi import BackgroundTasks, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.deadlines import Deadline, DeadlineMiddleware, current_deadline, enable_statement_timeouts
+
+# Counts to 10^8 one row at a time: many seconds unless interrupted
+SLOW_QUERY = text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c LIMIT 100000000) "
+    "SELECT count(*) FROM c"
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'slow.db'}", connect_args={"check_same_thread": False})
+    enable_statement_timeouts(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def slow_app(engine):
+    app = FastAPI()
+
+    @app.get("/slow-query")
+    def slow_query():
+        with engine.connect() as conn:
+            return {"count": conn.execute(SLOW_QUERY).scalar()}
+
+    @app.get("/fast")
+    def fast():
+        with engine.connect() as conn:
+            return {"value": conn.execute(text("SELECT 1")).scalar()}
+
+    app.add_middleware(DeadlineMiddleware, timeouts={"/fast": 0}, default=0.3)
+    return app
+
+
+def test_slow_query_is_interrupted_with_504(slow_app, engine):
+    client = TestClient(slow_app)
+    start = time.monotonic()
+    response = client.get("/slow-query")
+    assert response.status_code == 504
+    assert response.json()["code"] == 504
+    assert time.monotonic() - start < 2
+    # The connection went back to the pool with its progress handler cleared
+    assert engine.pool.checkedout() == 0
+    assert client.get("/fast").json() == {"value": 1}
+
+
+def test_statement_interrupted_for_another_request_maps_to_504():
+    app = FastAPI()
+
+    @app.get("/shared")
+    def shared():
+        # e.g. a query shared with a request whose deadline passed first
+        raise OperationalError("SELECT 1", {}, sqlite3.OperationalError("interrupted"))
+
+    app.add_middleware(DeadlineMiddleware, timeouts={}, default=5)
+    assert TestClient(app).get("/shared").status_code == 504
+
+
+def test_background_tasks_outlive_the_deadline_and_disconnect(engine, monkeypatch):
+    app = FastAPI()
+    finished = []
+    cancels = []
+    monkeypatch.setattr(Deadline, "cancel", lambda self, reason: cancels.append(reason))
+
+    async def after_response():
+        await asyncio.sleep(0.3)  # past the 0.1s deadline
+        with engine.connect() as conn:
+            finished.append(conn.execute(text("SELECT 1")).scalar())
+
+    @app.get("/signup")
+    def signup(background_tasks: BackgroundTasks):
+        background_tasks.add_task(after_response)
+        return {"status": "ok"}
+
+    app.add_middleware(DeadlineMiddleware, timeouts={}, default=0.1)
+    # TestClient sends http.disconnect as soon as the response is complete
+    assert TestClient(app).get("/signup").status_code == 200
+    assert finished == [1]
+    assert cancels == []
+
+
+def test_request_timeout_header_only_shortens(slow_app):
+    middleware = DeadlineMiddleware(slow_app, timeouts={"/fast": 0, "/long": 20}, default=5)
+    scope = lambda path, value: {"path": path, "headers": [(b"x-request-timeout", value)]}
+    assert middleware.timeout_for(scope("/other", b"1.5")) == 1.5
+    assert middleware.timeout_for(scope("/other", b"30")) == 5
+    assert middleware.timeout_for(scope("/other", b"junk")) == 5
+    assert middleware.timeout_for(scope("/fast", b"")) is None
+    assert middleware.timeout_for(scope("/fast", b"2")) == 2
+
+
+def test_cancelled_deadline_interrupts_running_statement(engine):
+    deadline = Deadline(timeout=60)
+
+    def run():
+        current_deadline.set(deadline)
+        with engine.connect() as conn:
+            conn.execute(SLOW_QUERY)
+
+    async def main():
+        task = asyncio.create_task(asyncio.to_thread(run))
+        await asyncio.sleep(0.2)
+        deadline.cancel("client disconnected")
+        with pytest.raises(OperationalError, match="interrupted"):
+            await asyncio.wait_for(task, 2)
+
+    asyncio.run(main())
+    assert engine.pool.checkedout() == 0
+
+
+def test_client_disconnect_cancels_the_request():
+    cancelled = asyncio.Event()
+    sent = []
+
+    async def app(scope, receive, send):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def main():
+        messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            await asyncio.sleep(0.05)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "path": "/items/", "headers": []}
+        await asyncio.wait_for(DeadlineMiddleware(app, default=5)(scope, receive, send), 2)
+
+    asyncio.run(main())
+    assert cancelled.is_set()
+    assert sent == []
@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+from app.events import EventHub, SQLiteEventBroker, sse_stream
+from app.models import ItemDB
+from app.repositories import ItemRepository
+from app.admission import admission_controller
+
+
+def parse(message: str) -> tuple[str, dict]:
+    event, data = message.strip().split("\n")
+    return event.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+
+def test_repository_writes_reach_stream_subscribers(db_session, monkeypatch):
+    hub = EventHub(buffer_size=10)
+    monkeypatch.setattr("app.repositories.item.item_events", hub)
+
+    async def main():
+        stream = sse_stream(hub, heartbeat_seconds=5)
+        assert (await anext(stream)).endswith(": connected\n\n")
+        # Sync routes write from the threadpool
+        repo = ItemRepository(db_session)
+        item = await asyncio.to_thread(repo.create, {"name": "Streamed Fan", "price": 25.0})
+        await asyncio.to_thread(repo.delete, item.id)
+        created, deleted = await anext(stream), await anext(stream)
+        await stream.aclose()
+        return item.id, created, deleted
+
+    item_id, created, deleted = asyncio.run(main())
+    assert parse(created) == (
+        "item.created",
+        {"id": item_id, "item": {"name": "Streamed Fan", "price": 25.0, "description": None}},
+    )
+    assert parse(deleted) == ("item.deleted", {"id": item_id})
+    assert len(hub) == 0
+
+
+def test_failed_publish_does_not_fail_the_committed_write(client, auth_headers, db_session, monkeypatch):
+    def broken(*args):
+        raise ConnectionError("broker down")
+
+    monkeypatch.setattr("app.repositories.item.item_events.publish", broken)
+    response = client.post("/items/", json={"name": "Unannounced Rug", "price": 30.0}, headers=auth_headers)
+    assert response.status_code == 201
+    assert db_session.query(ItemDB).filter_by(name="Unannounced Rug").count() == 1
+    assert client.get("/items/suggest", params={"prefix": "unannounced"}).json()["suggestions"] == [
+        "Unannounced Rug"
+    ]
+
+
+def test_slow_consumer_is_disconnected():
+    hub = EventHub(buffer_size=3)
+
+    async def main():
+        fast, slow = hub.subscribe(), hub.subscribe()
+        for i in range(3):
+            hub.publish("item.updated", {"id": i})
+            assert await fast.get(timeout=1) is not None
+        hub.publish("item.updated", {"id": 3})
+        return slow.overflowed
+
+    assert asyncio.run(main())
+    assert len(hub) == 1
+    assert hub.stats()["dropped_slow_consumers"] == 1
+
+
+def test_idle_stream_sends_keep_alives():
+    async def main():
+        stream = sse_stream(EventHub(buffer_size=1), heartbeat_seconds=0.01)
+        await anext(stream)
+        message = await anext(stream)
+        await stream.aclose()
+        return message
+
+    assert asyncio.run(main()) == ": keep-alive\n\n"
+
+
+def test_sqlite_broker_fans_out_other_processes_events(tmp_path, monkeypatch):
+    broker = SQLiteEventBroker(str(tmp_path / "events.db"))
+    assert broker.poll() == []
+    broker.publish("own event")
+    monkeypatch.setattr("app.events.os.getpid", lambda: -1)  # now a different worker
+    assert broker.poll() == ["own event"]
+    broker.publish("echo")
+    assert broker.poll() == []
+
+
+def test_stream_is_exempt_from_admission_control():
+    assert admission_controller.limiter_for("/items/stream") is None
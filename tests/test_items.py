@@ -0,0 +1,90 @@
+from sqlalchemy import event
+
+from app.models import ItemDB
+from app.repositories import BatchLoader, ItemRepository
+
+
+def test_read_items_returns_public_fields(client, auth_headers):
+    client.post(
+        "/items/",
+        json={"name": "Row Lamp", "price": 12.5, "description": "Desk lamp"},
+        headers=auth_headers,
+    )
+
+    response = client.get("/items/", params={"q": "Row Lamp"})
+    assert response.status_code == 200
+    assert response.json() == [
+        {"name": "Row Lamp", "price": 12.5, "description": "Desk lamp"}
+    ]
+
+
+def test_search_rows_bypasses_identity_map(db_session):
+    db_session.add(ItemDB(name="Untracked Chair", price=40.0))
+    db_session.commit()
+    db_session.expunge_all()
+
+    rows = ItemRepository(db_session).search_rows("Untracked")
+    assert [tuple(row) for row in rows] == [("Untracked Chair", 40.0, None)]
+    assert len(db_session.identity_map) == 0
+
+
+def test_sparse_fieldset_on_list_and_detail(client, db_session):
+    item = ItemDB(name="Sparse Kettle", price=30.0, description="Long text")
+    db_session.add(item)
+    db_session.commit()
+
+    response = client.get("/items/", params={"q": "Sparse", "fields": "name,price"})
+    assert response.status_code == 200
+    assert response.json() == [{"name": "Sparse Kettle", "price": 30.0}]
+
+    response = client.get(f"/items/{item.id}", params={"fields": "price"})
+    assert response.status_code == 200
+    assert response.json() == {"price": 30.0}
+
+
+def test_sparse_fieldset_rejects_unknown_fields(client):
+    response = client.get("/items/", params={"fields": "name,tax"})
+    assert response.status_code == 422
+    assert "tax" in response.json()["message"]
+
+
+def test_batch_get_preserves_order_and_reports_missing(client, db_session):
+    first = ItemDB(name="Batch A", price=1.0)
+    second = ItemDB(name="Batch B", price=2.0)
+    db_session.add_all([first, second])
+    db_session.commit()
+
+    response = client.get(
+        "/items/batch", params={"ids": [second.id, 999_999, first.id, second.id]}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["name"] for item in data["items"]] == ["Batch B", "Batch A"]
+    assert data["missing"] == [999_999]
+
+    response = client.post("/items/batch", json={"ids": [first.id, 888_888]})
+    assert response.status_code == 200
+    assert [item["name"] for item in response.json()["items"]] == ["Batch A"]
+    assert response.json()["missing"] == [888_888]
+
+
+def test_batch_loader_merges_lookups(db_session):
+    items = [ItemDB(name=f"Loader {i}", price=float(i)) for i in range(3)]
+    db_session.add_all(items)
+    db_session.commit()
+    ids = [item.id for item in items]
+    db_session.expunge_all()
+
+    statements = []
+    engine = db_session.get_bind()
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        loader = BatchLoader(ItemRepository(db_session))
+        loader.prefetch(*ids, 777_777)
+        assert loader.load(ids[0]).name == "Loader 0"
+        assert loader.load(777_777) is None
+        assert [item.name for item in loader.load_many(ids[1:])] == ["Loader 1", "Loader 2"]
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert len(statements) == 1
@@ -0,0 +1,54 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.loopmonitor import LoopMonitor
+
+
+def make_app(monitor: LoopMonitor) -> FastAPI:
+    @asynccontextmanager
+    async def lifespan(app):
+        monitor.start()
+        yield
+        monitor.stop()
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.get("/blocking")
+    async def blocking_handler():
+        time.sleep(0.3)  # sync call inside async def: stalls the loop
+        return {}
+
+    @app.get("/awaiting")
+    async def awaiting_handler():
+        await asyncio.sleep(0.3)
+        return {}
+
+    return app
+
+
+def test_stall_is_attributed_to_route_with_stack():
+    monitor = LoopMonitor(interval=0.02, stall_threshold=0.1, strict=True, fail_threshold=0.1)
+    with TestClient(make_app(monitor)) as client:
+        client.get("/awaiting")
+        assert monitor.take_violations() == []
+
+        client.get("/blocking")
+        time.sleep(0.1)  # let the monitor task observe the late wake-up
+        violations = monitor.take_violations()
+
+    assert len(violations) == 1
+    stall = violations[0]
+    assert stall.route == "GET /blocking"
+    assert stall.duration >= 0.25
+    assert "time.sleep(0.3)" in "".join(stall.stack)
+    assert monitor.stats()["stalls_by_route"]["GET /blocking"] == 1
+
+
+def test_loop_metrics_endpoint(client):
+    data = client.get("/metrics/loop").json()
+    assert set(data["lag_ms"]) == {"last", "p50", "p99", "max"}
+    assert data["stall_threshold_ms"] == 100.0
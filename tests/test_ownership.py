@@ -0,0 +1,92 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.config import settings
+from app.database import Base, ensure_schema
+from app.repositories import ItemRepository
+from app.security import create_access_token
+
+
+def test_create_item_requires_authentication(client):
+    response = client.post("/items/", json={"name": "Anonymous", "price": 1.0})
+    assert response.status_code == 401
+
+
+def test_only_the_owner_can_update_or_delete(client, auth_headers, db_session):
+    client.post("/items/", json={"name": "Guarded Vase", "price": 5.0}, headers=auth_headers)
+    item_id = db_session.query(models.ItemDB).filter_by(name="Guarded Vase").one().id
+    stranger = models.UserDB(username="stranger", hashed_password="x")
+    db_session.add(stranger)
+    db_session.commit()
+    stranger_headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'stranger'})}"}
+
+    assert client.patch(f"/items/{item_id}", json={"price": 1.0}).status_code == 401
+    assert client.delete(f"/items/{item_id}").status_code == 401
+    assert client.patch(f"/items/{item_id}", json={"price": 1.0}, headers=stranger_headers).status_code == 403
+    assert client.delete(f"/items/{item_id}", headers=stranger_headers).status_code == 403
+    assert client.delete("/items/999999", headers=auth_headers).status_code == 404
+
+    response = client.patch(f"/items/{item_id}", json={"price": 6.0}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["item"]["price"] == 6.0
+    assert client.delete(f"/items/{item_id}", headers=auth_headers).status_code == 200
+
+
+def test_my_items_and_quota(client, auth_headers, test_user, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "items_per_user", test_user.item_count + 2)
+
+    for name in ("Owned Pen", "Owned Ink"):
+        response = client.post("/items/", json={"name": name, "price": 2.0}, headers=auth_headers)
+        assert response.status_code == 201
+    response = client.post("/items/", json={"name": "One Too Many", "price": 2.0}, headers=auth_headers)
+    assert response.status_code == 403
+
+    names = [i["name"] for i in client.get("/users/me/items", headers=auth_headers).json()]
+    assert names[-2:] == ["Owned Pen", "Owned Ink"]
+
+    # Deleting frees a slot in the same transaction
+    owned = db_session.query(models.ItemDB).filter_by(name="Owned Pen").one()
+    assert client.delete(f"/items/{owned.id}", headers=auth_headers).status_code == 200
+    response = client.post("/items/", json={"name": "Owned Nib", "price": 2.0}, headers=auth_headers)
+    assert response.status_code == 201
+
+
+def test_quota_holds_under_parallel_creates(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'quota.db'}", connect_args={"check_same_thread": False, "timeout": 30}
+    )
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with Session() as db:
+        user = models.UserDB(username="racer", hashed_password="x")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+    def create(i):
+        with Session() as db:
+            item = ItemRepository(db).create_owned({"name": f"Race {i}", "price": 1.0}, user_id, quota=5)
+            return item is not None
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        created = sum(pool.map(create, range(40)))
+
+    with Session() as db:
+        stored = db.query(models.ItemDB).filter_by(owner_id=user_id).count()
+        counter = db.get(models.UserDB, user_id).item_count
+    assert created == stored == counter == 5
+
+
+def test_ensure_schema_adds_new_columns_to_old_tables(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, username VARCHAR)"))
+        conn.execute(text("INSERT INTO users (username) VALUES ('legacy')"))
+
+    ensure_schema(engine)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT item_count FROM users")).scalar() == 0
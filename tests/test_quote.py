@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from app.models import ItemDB
+from app.quote import MAX_CENTS, QuoteTooLarge, compute_quote, to_cents
+
+
+def test_to_cents_rounds_half_up_despite_float_noise():
+    assert to_cents([1.005, 2.675, 0.125, 19.99, 0.0]).tolist() == [101, 268, 13, 1999, 0]
+
+
+def test_compute_quote_totals_are_exact_in_cents():
+    catalog = np.array([[2, 0.10, 0.0], [1, 19.99, 1.6]])
+    quote = compute_quote([1, 2, 1], [3, 7, 1], catalog)
+
+    assert quote.subtotal.tolist() == [5997, 70, 1999]
+    assert quote.tax.tolist() == [480, 0, 160]
+    assert quote.missing == []
+    data = quote.as_dict()
+    assert (data["subtotal"], data["tax"], data["total"]) == (80.66, 6.4, 87.06)
+    assert data["lines"][1] == {
+        "item_id": 2, "quantity": 7, "unit_price": 0.1,
+        "subtotal": 0.7, "tax": 0.0, "total": 0.7,
+    }
+
+
+def test_compute_quote_reports_missing_ids():
+    quote = compute_quote([5, 9, 5], [1, 1, 1], np.empty((0, 3)))
+    assert quote.missing == [5, 9]
+    assert quote.subtotal.sum() == 0
+
+
+def test_null_and_out_of_range_prices_are_unpriced():
+    catalog = np.array([[1, np.nan, 0.0], [2, 1e300, 0.0], [3, 2.5, np.inf], [4, 1.0, 0.0]])
+    quote = compute_quote([1, 2, 3, 4], [1, 1, 1, 2], catalog)
+
+    assert quote.unpriced == [1, 2, 3]
+    assert quote.subtotal.tolist() == [0, 0, 0, 200]
+    with pytest.raises(ValueError):
+        to_cents([np.nan])
+
+
+def test_overflowing_lines_and_totals_are_rejected():
+    huge = (MAX_CENTS // 100 - 1) / 100  # just under MAX_CENTS once in cents
+    catalog = np.array([[1, huge, 0.0], [2, 1_000_000.0, 0.0]])
+    with pytest.raises(QuoteTooLarge):
+        compute_quote([1], [1_000_000], catalog)
+    with pytest.raises(QuoteTooLarge):
+        compute_quote([2] * 100_000, [1_000_000] * 100_000, catalog)
+    assert compute_quote([1], [1], catalog).subtotal.tolist() == [MAX_CENTS // 100 - 1]
+
+
+def test_quote_endpoint(client, db_session):
+    lamp = ItemDB(name="Quote Lamp", price=12.5, tax=1.25)
+    cable = ItemDB(name="Quote Cable", price=3.33)
+    db_session.add_all([lamp, cable])
+    db_session.commit()
+
+    cart = {"lines": [
+        {"item_id": lamp.id, "quantity": 2},
+        {"item_id": cable.id, "quantity": 3},
+    ]}
+    response = client.post("/items/quote", json=cart)
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["subtotal"], data["tax"], data["total"]) == (34.99, 2.5, 37.49)
+    assert [line["total"] for line in data["lines"]] == [27.5, 9.99]
+
+    response = client.post("/items/quote", json={**cart, "include_lines": False})
+    assert "lines" not in response.json()
+
+    cart["lines"].append({"item_id": 999_999, "quantity": 1})
+    response = client.post("/items/quote", json=cart)
+    assert response.status_code == 404
+    assert "999999" in response.json()["message"]
+
+    free = ItemDB(name="Quote Freebie", price=None)
+    db_session.add(free)
+    db_session.commit()
+    response = client.post("/items/quote", json={"lines": [{"item_id": free.id, "quantity": 1}]})
+    assert response.status_code == 409
+    assert str(free.id) in response.json()["message"]
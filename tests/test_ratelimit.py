@@ -0,0 +1,80 @@
+import pytest
+
+from app.ratelimit import (
+    MemoryBucketStore,
+    RateLimitResult,
+    RateLimitRule,
+    SQLiteBucketStore,
+    rate_limiter,
+)
+
+
+@pytest.mark.parametrize("make_store", [MemoryBucketStore, None])
+def test_bucket_allows_burst_then_blocks(make_store, tmp_path):
+    store = make_store() if make_store else SQLiteBucketStore(str(tmp_path / "rl.db"))
+    rule = RateLimitRule.parse("3/minute")
+
+    results = [store.take("k", rule) for _ in range(4)]
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert results[2].remaining == 0
+    assert results[3].headers["Retry-After"] == "20"
+    assert store.take("other", rule).allowed
+
+
+def test_retry_after_rounds_up():
+    result = lambda retry_after: RateLimitResult(False, 1, 0, retry_after, retry_after)
+    assert [result(s).headers["Retry-After"] for s in (0.2, 1.0, 2.0, 2.5)] == ["1", "1", "2", "3"]
+
+
+def test_eviction_keeps_buckets_of_slower_rules(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("app.ratelimit.time.monotonic", lambda: clock[0])
+    store = MemoryBucketStore(shards=1, max_keys_per_shard=3)
+    hourly, per_second = RateLimitRule.parse("2/hour"), RateLimitRule.parse("5/second")
+
+    store.take("login:alice", hourly)
+    store.take("search:0", per_second)
+    store.take("search:1", per_second)
+    clock[0] += 10
+    store.take("search:2", per_second)  # fourth key: triggers a sweep
+
+    # Refilled per-second buckets are gone; the hourly one is still counting
+    assert set(store._shards[0]) == {"login:alice", "search:2"}
+    assert store.take("login:alice", hourly).remaining == 0
+
+
+def test_sqlite_store_purges_refilled_buckets(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("app.ratelimit.time.time", lambda: clock[0])
+    store = SQLiteBucketStore(str(tmp_path / "rl.db"), purge_seconds=30)
+    hourly, per_second = RateLimitRule.parse("2/hour"), RateLimitRule.parse("5/second")
+
+    store.take("login:alice", hourly)
+    store.take("search:0", per_second)
+    clock[0] += 10
+    store.take("search:1", per_second)  # within purge_seconds: nothing deleted
+    clock[0] += 30
+    store.take("search:2", per_second)
+
+    keys = {key for key, in store._conn().execute("SELECT key FROM rate_limit_buckets")}
+    assert keys == {"login:alice", "search:2"}
+    assert store.take("login:alice", hourly).remaining == 0
+
+
+def test_rule_parsing_rejects_garbage():
+    assert RateLimitRule.parse("100/hours") == RateLimitRule(limit=100, period=3600)
+    with pytest.raises(ValueError):
+        RateLimitRule.parse("fast")
+
+
+def test_token_endpoint_is_throttled_per_username(client, test_user, monkeypatch):
+    monkeypatch.setitem(rate_limiter.rules, "token_username", RateLimitRule.parse("2/minute"))
+    assert client.post("/token", data={"username": "johndoe", "password": "wrong"}).status_code == 400
+    response = client.post("/token", data={"username": "johndoe", "password": "secret"})
+    assert response.status_code == 200
+    assert response.headers["RateLimit-Remaining"] == "0"
+
+    response = client.post("/token", data={"username": "johndoe", "password": "secret"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+    assert response.json()["message"] == "Too many requests"
@@ -0,0 +1,83 @@
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+
+from app import database
+from app.database import PRIMARY_STICKY_COOKIE, Base, ReplicaSet, get_read_db
+from app.main import app
+
+
+def make_request(cookies: dict | None = None) -> Request:
+    cookie = "; ".join(f"{k}={v}" for k, v in (cookies or {}).items())
+    headers = [(b"cookie", cookie.encode())] if cookie else []
+    return Request({"type": "http", "headers": headers})
+
+
+def read_db_url(request: Request) -> str:
+    gen = get_read_db(request)
+    db = next(gen)
+    url = str(db.get_bind().url)
+    gen.close()
+    return url
+
+
+def test_reads_rotate_over_replicas_unless_sticky(tmp_path, monkeypatch):
+    urls = [f"sqlite:///{tmp_path / name}" for name in ("r1.db", "r2.db")]
+    monkeypatch.setattr(database, "replicas", ReplicaSet(urls))
+
+    assert [read_db_url(make_request()) for _ in range(3)] == [urls[0], urls[1], urls[0]]
+
+    sticky = {PRIMARY_STICKY_COOKIE: str(int(time.time()) + 60)}
+    assert read_db_url(make_request(sticky)) == str(database.engine.url)
+
+    expired = {PRIMARY_STICKY_COOKIE: str(int(time.time()) - 1)}
+    assert read_db_url(make_request(expired)) in urls
+
+
+def test_least_busy_prefers_idle_replica(tmp_path):
+    replicas = ReplicaSet(
+        [f"sqlite:///{tmp_path / name}" for name in ("a.db", "b.db")], "least_busy"
+    )
+    first = replicas.acquire()
+    second = replicas.acquire()
+    assert first is not second
+    replicas.release(first)
+    assert replicas.acquire() is first
+
+
+def test_sqlite_replicas_are_refreshed_from_primary(tmp_path, monkeypatch):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    with primary.begin() as conn:
+        conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        conn.execute(text("INSERT INTO t VALUES (42)"))
+    monkeypatch.setattr(database, "engine", primary)
+    monkeypatch.setattr(database, "replicas", ReplicaSet([f"sqlite:///{tmp_path / 'replica.db'}"]))
+
+    database.refresh_sqlite_replicas()
+
+    replica = database.replicas.replicas[0].engine
+    with replica.connect() as conn:
+        assert conn.execute(text("SELECT x FROM t")).scalar() == 42
+
+
+def test_search_cache_keeps_replica_results_from_sticky_clients(client, db_session, auth_headers, tmp_path):
+    replica = create_engine(f"sqlite:///{tmp_path / 'stale.db'}")
+    Base.metadata.create_all(bind=replica)  # a replica that hasn't caught up
+    client.post("/items/", json={"name": "Sticky Globe", "price": 4.0}, headers=auth_headers)
+
+    def read_db(request: Request):
+        if PRIMARY_STICKY_COOKIE in request.cookies:
+            yield db_session
+            return
+        with Session(replica) as db:
+            yield db
+
+    app.dependency_overrides[get_read_db] = read_db
+    assert client.get("/items/", params={"q": "Sticky"}).json() == []
+
+    client.cookies.set(PRIMARY_STICKY_COOKIE, str(int(time.time()) + 60))
+    names = [item["name"] for item in client.get("/items/", params={"q": "Sticky"}).json()]
+    assert names == ["Sticky Globe"]
+    replica.dispose()
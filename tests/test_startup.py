@@ -0,0 +1,77 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect
+
+from app.database import ensure_schema
+from app.models import ItemDB
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# Generous ceilings so slow CI machines pass; a regression that reintroduces
+# import-time hashing or eager subsystems shows up in the module checks below.
+IMPORT_BUDGET_SECONDS = 3.0
+FIRST_REQUEST_BUDGET_SECONDS = 5.0
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter() - start
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    assert client.get("/health").status_code == 200
+first_request = time.perf_counter() - start
+print(json.dumps({
+    "import": imported,
+    "first_request": first_request,
+    "modules": sorted(m for m in ("passlib", "jinja2") if m in sys.modules),
+}))
+"""
+
+
+def run_probe(tmp_path):
+    env = {
+        "ADMIN_EMAIL": "admin@example.com",
+        "SECRET_KEY": "test-secret",
+        "DATABASE_URL": f"sqlite:///{tmp_path / 'startup.db'}",
+        "FAST_START": "true",
+        "PATH": "",
+    }
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", PROBE],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_cold_start_stays_fast_and_lazy(tmp_path):
+    result = run_probe(tmp_path)
+    assert result["modules"] == []
+    assert result["import"] < IMPORT_BUDGET_SECONDS
+    assert result["first_request"] < FIRST_REQUEST_BUDGET_SECONDS
+
+
+def test_schema_created_once_per_model_version(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    assert ensure_schema(engine) is True
+    assert ensure_schema(engine) is False
+
+
+def test_upgrade_creates_new_indexes_and_drops_retired_ones(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    with engine.begin() as conn:
+        # items as it was before the composite indexes
+        conn.exec_driver_sql(
+            "CREATE TABLE items (id INTEGER PRIMARY KEY, name VARCHAR, price FLOAT, "
+            "description VARCHAR, tax FLOAT)"
+        )
+        conn.exec_driver_sql("CREATE INDEX ix_items_id ON items (id)")
+        conn.exec_driver_sql("CREATE INDEX ix_items_name ON items (name)")
+
+    assert ensure_schema(engine) is True
+    names = {index["name"] for index in inspect(engine).get_indexes("items")}
+    assert "ix_items_name" not in names
+    assert {index.name for index in ItemDB.__table__.indexes} <= names
@@ -0,0 +1,95 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.models import ItemDB
+from app.suggest import NameIndex, item_name_index
+
+
+def test_prefix_suggestions_are_sorted_and_distinct():
+    index = NameIndex()
+    index.load([(1, "Wireless Mouse"), (2, "Wired Keyboard"), (3, "Webcam"), (4, "Wireless Mouse")])
+
+    assert index.suggest("wir") == ["Wired Keyboard", "Wireless Mouse"]
+    assert index.suggest("WIRELESS", limit=1) == ["Wireless Mouse"]
+    assert index.suggest("xyz") == []
+
+
+def test_incremental_updates_and_typo_tolerance():
+    index = NameIndex()
+    index.load([(1, "Monitor Stand")], background=False)
+    index.add(2, "Mouse Pad")
+    index.add(1, "Laptop Stand")  # rename
+    index.remove(2)
+
+    assert index.suggest("mo") == []
+    assert index.suggest("lap") == ["Laptop Stand"]
+    assert index.suggest("laptp", fuzzy=True) == ["Laptop Stand"]
+    assert index.memory_usage()["names"] == 1
+
+
+def test_suggest_endpoint_follows_item_writes(client, auth_headers):
+    response = client.post(
+        "/items/", json={"name": "Suggest Speaker", "price": 20.0}, headers=auth_headers
+    )
+    assert response.status_code == 201
+
+    response = client.get("/items/suggest", params={"prefix": "sugg"})
+    assert response.status_code == 200
+    assert response.json()["suggestions"] == ["Suggest Speaker"]
+
+    stats = client.get("/items/suggest/stats").json()
+    assert stats["names"] >= 1
+    assert stats["total_bytes"] > 0
+
+
+def test_updates_split_and_drop_chunks():
+    index = NameIndex()
+    index.chunk_size = 4
+    index.load([(i, f"Item {i:03d}") for i in range(20)])
+    for i in range(20, 60):
+        index.add(i, f"Item {i:03d}")
+    for i in range(10, 50):
+        index.remove(i)
+    index.add(5, "Renamed Item")
+
+    assert all(0 < len(chunk) <= 8 for chunk in index._keys)
+    assert index._maxes == [chunk[-1] for chunk in index._keys]
+    kept = [i for i in range(60) if i != 5 and not 10 <= i < 50]
+    assert index.suggest("item 0", limit=50) == [f"Item {i:03d}" for i in kept]
+    assert index.suggest("item 05", limit=3) == ["Item 050", "Item 051", "Item 052"]
+    assert index.suggest("renamed") == ["Renamed Item"]
+
+
+def test_sync_applies_writes_from_other_workers(client, auth_headers, db_session):
+    index = NameIndex()
+    index.build(db_session)
+    client.post("/items/", json={"name": "Synced Lamp", "price": 9.0}, headers=auth_headers)
+    assert index.suggest("synced") == []
+
+    assert index.sync(db_session) == 1
+    assert index.suggest("synced") == ["Synced Lamp"]
+
+    item = db_session.query(ItemDB).filter_by(name="Synced Lamp").one()
+    client.delete(f"/items/{item.id}", headers=auth_headers)
+    index.sync(db_session)
+    assert index.suggest("synced") == []
+
+
+def test_lazy_build_runs_once(client, db_session, monkeypatch):
+    monkeypatch.setattr(item_name_index, "ready", False)
+    with item_name_index._build_lock:  # another request is building
+        response = client.get("/items/suggest", params={"prefix": "a"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+    builds = []
+
+    def slow_build(db):
+        builds.append(db)
+        time.sleep(0.1)
+        item_name_index.ready = True
+
+    monkeypatch.setattr(item_name_index, "build", slow_build)
+    with ThreadPoolExecutor(5) as pool:
+        list(pool.map(lambda _: item_name_index.try_build(db_session), range(5)))
+    assert len(builds) == 1
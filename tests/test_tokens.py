@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import time
+from datetime import timedelta
+
+from app import security
+from app.revocation import BloomFilter, RevocationList, revocation_list, utcnow
+
+
+def login(client):
+    response = client.post("/token", data={"username": "johndoe", "password": "secret"})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1_000, error_rate=0.01)
+    keys = [f"jti-{i}" for i in range(1_000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+    assert false_positives < 300
+
+
+def test_refresh_rotates_and_rejects_replay(client, test_user):
+    tokens = login(client)
+    assert tokens["refresh_token"]
+
+    response = client.post("/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200
+    rotated = response.json()
+    me = client.get("/users/me", headers={"Authorization": f"Bearer {rotated['access_token']}"})
+    assert me.json()["username"] == "johndoe"
+
+    replay = client.post("/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert replay.status_code == 401
+    # An access token is not a refresh token
+    wrong = client.post("/token/refresh", json={"refresh_token": tokens["access_token"]})
+    assert wrong.status_code == 401
+
+
+def test_revoked_access_token_is_rejected(client, test_user):
+    tokens = login(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    checks = revocation_list.db_checks
+    assert client.get("/users/me", headers=headers).status_code == 200
+    # Not in the Bloom filter, so no revocation lookup was needed
+    assert revocation_list.db_checks == checks
+
+    response = client.post(
+        "/token/revoke", json={"refresh_token": tokens["refresh_token"]}, headers=headers
+    )
+    assert response.status_code == 200
+    assert client.get("/users/me", headers=headers).status_code == 401
+    refresh = client.post("/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert refresh.status_code == 401
+
+
+def test_other_workers_pick_up_revocations_on_sync(db_session):
+    other_worker = RevocationList(1_000, 0.001, sync_interval=60, rebuild_interval=3600)
+    other_worker.rebuild(db_session)
+
+    revocation_list.revoke(db_session, "synced-jti", utcnow() + timedelta(minutes=5))
+    assert not other_worker.is_revoked(db_session, "synced-jti")
+
+    other_worker._next_sync = 0.0  # sync interval elapsed
+    assert other_worker.is_revoked(db_session, "synced-jti")
+
+
+def test_tokens_carry_unique_jti():
+    first = security.decode_token(security.create_access_token({"sub": "a"}))
+    second = security.decode_token(security.create_access_token({"sub": "a"}))
+    assert first["jti"] != second["jti"]
+    assert first["type"] == "access"
+
+
+def test_concurrent_revoke_of_the_same_jti_returns_false(db_session, monkeypatch):
+    expires = utcnow() + timedelta(minutes=5)
+    assert revocation_list.revoke(db_session, "raced-jti", expires)
+    # Both requests passed the existence check before either committed
+    monkeypatch.setattr(db_session, "get", lambda *args: None)
+    assert revocation_list.revoke(db_session, "raced-jti", expires) is False
+
+
+def test_refresh_runs_once_and_off_the_event_loop(db_session, monkeypatch):
+    revocations = RevocationList(1_000, 0.001, sync_interval=60, rebuild_interval=3600)
+    revocations.rebuild(db_session)
+    loop_thread = threading.get_ident()
+    syncs = []
+
+    def slow_sync(db):
+        syncs.append(threading.get_ident())
+        time.sleep(0.05)
+        revocations._next_sync = time.monotonic() + 60
+
+    monkeypatch.setattr(revocations, "sync", slow_sync)
+    revocations._next_sync = 0.0
+
+    async def main():
+        await asyncio.gather(*(revocations.is_revoked_async(db_session, "jti") for _ in range(5)))
+
+    asyncio.run(main())
+    assert len(syncs) == 1
+    assert syncs[0] != loop_thread